@@ -1,16 +1,6 @@
 """The Miner integration."""
 from __future__ import annotations
 
-
-try:
-    import pyasic
-except ImportError:
-    from .patch import install_package
-    from .const import PYASIC_VERSION
-
-    install_package(f"pyasic=={PYASIC_VERSION}")
-    import pyasic
-
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
@@ -19,7 +9,10 @@ from homeassistant.exceptions import ConfigEntryNotReady
 from .const import CONF_IP
 from .const import DOMAIN
 from .coordinator import MinerCoordinator
+from .detection_cache import async_get_detection_cache
+from .patch import async_ensure_pyasic
 from .services import async_setup_services
+from .transport import async_setup_shared_transport
 
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
@@ -31,20 +24,49 @@ PLATFORMS: list[Platform] = [
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up Miner from a config entry."""
+    await async_ensure_pyasic(hass)
+    async_setup_shared_transport(hass)
+
+    import pyasic
 
     miner_ip = config_entry.data[CONF_IP]
-    miner = await pyasic.get_miner(miner_ip)
+    detection_cache = await async_get_detection_cache(hass)
+    miner = detection_cache.async_build_miner(miner_ip)
+    miner_cached = miner is not None
+    if miner is None:
+        miner = await pyasic.get_miner(miner_ip)
 
     if miner is None:
         raise ConfigEntryNotReady("Miner could not be found.")
 
-    m_coordinator = MinerCoordinator(hass, config_entry)
+    m_coordinator = MinerCoordinator(
+        hass,
+        config_entry,
+        miner=miner,
+        detection_cache=detection_cache,
+        miner_cached=miner_cached,
+    )
     hass.data.setdefault(DOMAIN, {})[config_entry.entry_id] = m_coordinator
 
-    await m_coordinator.async_config_entry_first_refresh()
+    record = detection_cache.async_get(miner_ip) if miner_cached else None
+    if record is not None and m_coordinator.async_set_cached_data(record):
+        # Entities are created from the cached identity, the first poll
+        # fills in their data without holding up the setup.
+        config_entry.async_create_background_task(
+            hass,
+            m_coordinator.async_refresh(),
+            f"MinerMonitor first refresh {config_entry.title}",
+        )
+    else:
+        await m_coordinator.async_config_entry_first_refresh()
+    config_entry.async_on_unload(
+        m_coordinator.fleet.async_add_coordinator(m_coordinator)
+    )
 
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
+    config_entry.async_on_unload(config_entry.add_update_listener(async_reload_entry))
+
     await async_setup_services(hass)
 
     return True
@@ -59,3 +81,8 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
         hass.data[DOMAIN].pop(config_entry.entry_id)
 
     return unload_ok
+
+
+async def async_reload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Reload a config entry when its options change."""
+    await hass.config_entries.async_reload(config_entry.entry_id)
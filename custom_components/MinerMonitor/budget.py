@@ -0,0 +1,177 @@
+"""Fleet power budget distributed over the power limits of the miners."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .const import CONF_MAX_POWER
+from .const import CONF_MIN_POWER
+from .const import DEFAULT_MAX_POWER
+from .const import DEFAULT_MIN_POWER
+from .const import DEFAULT_POWER_BUDGET_SETTLE
+from .const import DEFAULT_POWER_LIMIT_STEP
+from .snapshot import miner_sensor_accessor
+
+if TYPE_CHECKING:
+    from .coordinator import MinerCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+_CONSUMPTION = miner_sensor_accessor("miner_consumption")
+_EFFICIENCY = miner_sensor_accessor("efficiency")
+_POWER_LIMIT = miner_sensor_accessor("power_limit")
+
+
+def distribute_power_budget(
+    budget: float,
+    min_power: Sequence[float],
+    max_power: Sequence[float],
+    efficiency: Sequence[float | None],
+    step: int = DEFAULT_POWER_LIMIT_STEP,
+) -> np.ndarray:
+    """Split a power budget into power limits, favoring efficient miners.
+
+    Every miner gets its minimum, the rest of the budget is shared by the
+    inverse of the efficiency (W/TH) and capped at the maximum of each
+    miner, whatever a capped miner cannot take goes to the others.  Limits
+    are rounded down to the step so the sum never exceeds the budget,
+    unless the budget is below the sum of the minimums.
+    """
+    low = np.asarray(min_power, dtype=np.float64)
+    high = np.maximum(np.asarray(max_power, dtype=np.float64), low)
+    weight = 1 / np.array(
+        [value if value else np.nan for value in efficiency], dtype=np.float64
+    )
+    # Miners without a known efficiency count as an average one
+    unknown = ~np.isfinite(weight) | (weight <= 0)
+    weight[unknown] = weight[~unknown].mean() if (~unknown).any() else 1.0
+
+    limits = low.copy()
+    remaining = budget - limits.sum()
+    open_ = limits < high
+    while remaining > 1e-6 and open_.any():
+        share = remaining * weight * open_ / weight[open_].sum()
+        added = np.minimum(share, high - limits)
+        limits += added
+        remaining -= added.sum()
+        open_ = limits < high - 1e-6
+
+    stepped = np.maximum(np.floor(limits / step) * step, low)
+    return np.minimum(stepped, high)
+
+
+async def async_apply_power_budget(
+    coordinators: Sequence[MinerCoordinator],
+    budget: float,
+    timeout: float,
+    concurrency: int,
+) -> dict:
+    """Apply a power budget to the miners and wait until they converge.
+
+    Miners without autotuning keep their current consumption, which is
+    taken from the budget first.  Miners whose last poll failed are
+    skipped, their share goes to the reachable ones.  The limits are written in parallel and
+    the miners are polled until they report their new limit, all within
+    the timeout.  Miners that read back their new limit right after the
+    write are converged without another poll.
+    """
+    started = time.monotonic()
+    tunable = []
+    skipped = []
+    reserved = 0.0
+    for coordinator in coordinators:
+        if coordinator.miner is not None and coordinator.miner.supports_autotuning:
+            # The share of an unreachable miner would be lost
+            if coordinator.last_update_success and coordinator.data is not None:
+                tunable.append(coordinator)
+            else:
+                skipped.append(coordinator)
+        elif consumption := _CONSUMPTION(coordinator.data):
+            reserved += consumption
+
+    limits = distribute_power_budget(
+        budget - reserved,
+        [c.config_entry.data.get(CONF_MIN_POWER, DEFAULT_MIN_POWER) for c in tunable],
+        [c.config_entry.data.get(CONF_MAX_POWER, DEFAULT_MAX_POWER) for c in tunable],
+        [_EFFICIENCY(c.data) for c in tunable],
+    )
+    results = {
+        coordinator.config_entry.entry_id: {
+            "name": coordinator.config_entry.title,
+            "previous_limit": _POWER_LIMIT(coordinator.data),
+            "power_limit": int(limit),
+            "success": False,
+            "converged": False,
+        }
+        for coordinator, limit in zip(tunable, limits)
+    }
+    results.update(
+        {
+            coordinator.config_entry.entry_id: {
+                "name": coordinator.config_entry.title,
+                "previous_limit": _POWER_LIMIT(coordinator.data),
+                "power_limit": None,
+                "success": False,
+                "converged": False,
+                "skipped": True,
+                "error": "Miner Offline",
+            }
+            for coordinator in skipped
+        }
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _async_set(coordinator: MinerCoordinator) -> None:
+        result = results[coordinator.config_entry.entry_id]
+        async with semaphore:
+            try:
+                applied = await coordinator.async_set_power_limit(result["power_limit"])
+                result["success"] = True
+                result["converged"] = applied == result["power_limit"]
+            except Exception as err:
+                _LOGGER.debug(
+                    "Setting the power limit of %s failed: %s", coordinator.name, err
+                )
+                result["error"] = str(err)
+
+    async def _async_converge(coordinator: MinerCoordinator) -> None:
+        result = results[coordinator.config_entry.entry_id]
+        while True:
+            async with semaphore:
+                await coordinator.async_refresh()
+            if _POWER_LIMIT(coordinator.data) == result["power_limit"]:
+                result["converged"] = True
+                return
+            await asyncio.sleep(DEFAULT_POWER_BUDGET_SETTLE)
+
+    try:
+        async with asyncio.timeout(timeout):
+            await asyncio.gather(*(_async_set(c) for c in tunable))
+            await asyncio.gather(
+                *(
+                    _async_converge(c)
+                    for c in tunable
+                    if results[c.config_entry.entry_id]["success"]
+                    and not results[c.config_entry.entry_id]["converged"]
+                )
+            )
+    except TimeoutError:
+        _LOGGER.debug("Power budget of %sW did not converge in %ss", budget, timeout)
+
+    allocated = int(limits.sum())
+    return {
+        "budget": budget,
+        "reserved": round(reserved, 2),
+        "allocated": allocated,
+        "feasible": allocated + reserved <= budget,
+        "converged": all(
+            result["converged"] for result in results.values() if "skipped" not in result
+        ),
+        "elapsed": round(time.monotonic() - started, 3),
+        "miners": results,
+    }
@@ -0,0 +1,99 @@
+"""Exponential backoff and circuit breaker for offline miners."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from enum import StrEnum
+
+from .const import DEFAULT_BACKOFF_BASE
+from .const import DEFAULT_BACKOFF_MAX
+from .const import DEFAULT_FAILURE_THRESHOLD
+
+# Ports answered by the RPC and web backends of the supported firmwares
+PROBE_PORTS = (4028, 80, 443)
+PROBE_TIMEOUT = 2
+
+
+class BreakerState(StrEnum):
+    """State of a miner circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class MinerCircuitBreaker:
+    """Track failed polls of a miner and back off while it is offline.
+
+    After a number of consecutive failures the breaker opens and no polls
+    are made until the backoff has passed.  The breaker then goes half-open
+    and allows a single probe; a failure there opens it again with twice the
+    backoff, a success closes it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self.failure_threshold = failure_threshold
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the next probe is allowed."""
+        if self.state is not BreakerState.OPEN:
+            return 0
+        return max(self._open_until - time.monotonic(), 0)
+
+    def allow_request(self) -> bool:
+        """Return if the miner may be polled, going half-open once due."""
+        if self.state is BreakerState.OPEN:
+            if time.monotonic() < self._open_until:
+                return False
+            self.state = BreakerState.HALF_OPEN
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful poll."""
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self._trips = 0
+
+    def record_failure(self) -> None:
+        """Count a failed poll and open the breaker if required."""
+        self.failures += 1
+        if (
+            self.state is BreakerState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            backoff = min(self.backoff_base * 2**self._trips, self.backoff_max)
+            self._trips += 1
+            self.state = BreakerState.OPEN
+            self._open_until = time.monotonic() + backoff
+
+
+async def async_probe_miner(ip: str) -> bool:
+    """Return if any of the miner backends accepts a connection."""
+
+    async def _probe(port: int) -> bool:
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(ip, port), timeout=PROBE_TIMEOUT
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        with contextlib.suppress(OSError):
+            await writer.wait_closed()
+        return True
+
+    return any(await asyncio.gather(*(_probe(port) for port in PROBE_PORTS)))
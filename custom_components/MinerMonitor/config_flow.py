@@ -1,58 +1,64 @@
 """Config flow for Miner."""
-import logging
-from importlib.metadata import version
-
-from .const import PYASIC_VERSION
-
-try:
-    import pyasic
+from __future__ import annotations
 
-    if not version("pyasic") == PYASIC_VERSION:
-        raise ImportError
-except ImportError:
-    from .patch import install_package
-
-    install_package(f"pyasic=={PYASIC_VERSION}")
-    import pyasic
-
-from pyasic import MinerNetwork
+import asyncio
+import ipaddress
+import logging
+import re
+from typing import TYPE_CHECKING
 
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.components import network
+from homeassistant.core import callback
 from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
 from homeassistant.helpers.config_entry_flow import register_discovery_flow
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.selector import SelectOptionDict
+from homeassistant.helpers.selector import SelectSelector
+from homeassistant.helpers.selector import SelectSelectorConfig
+from homeassistant.helpers.selector import SelectSelectorMode
 from homeassistant.helpers.selector import TextSelector
 from homeassistant.helpers.selector import TextSelectorConfig
 from homeassistant.helpers.selector import TextSelectorType
 
+from .const import CONF_ADAPTIVE_POLLING
 from .const import CONF_IP
-from .const import CONF_MIN_POWER
+from .const import CONF_MAX_POLL_INTERVAL
 from .const import CONF_MAX_POWER
+from .const import CONF_MIN_POLL_INTERVAL
+from .const import CONF_MIN_POWER
+from .const import CONF_REDETECT_INTERVAL
 from .const import CONF_RPC_PASSWORD
+from .const import CONF_SLOW_POLL_INTERVAL
 from .const import CONF_SSH_PASSWORD
 from .const import CONF_SSH_USERNAME
 from .const import CONF_TITLE
+from .const import CONF_USE_DEADBANDS
 from .const import CONF_WEB_PASSWORD
 from .const import CONF_WEB_USERNAME
+from .const import DEFAULT_BULK_CONCURRENCY
+from .const import DEFAULT_BULK_MAX_HOSTS
+from .const import DEFAULT_MAX_POLL_INTERVAL
+from .const import DEFAULT_MAX_POWER
+from .const import DEFAULT_MIN_POLL_INTERVAL
+from .const import DEFAULT_MIN_POWER
+from .const import DEFAULT_REDETECT_INTERVAL
+from .const import DEFAULT_SLOW_POLL_INTERVAL
 from .const import DOMAIN
+from .detection_cache import async_get_detection_cache
+from .discovery import async_get_discovery
+from .patch import async_ensure_pyasic
+
+if TYPE_CHECKING:
+    import pyasic
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def _async_has_devices(hass: HomeAssistant) -> bool:
     """Return if there are devices that can be discovered."""
-    adapters = await network.async_get_adapters(hass)
-
-    for adapter in adapters:
-        for ip_info in adapter["ipv4"]:
-            local_ip = ip_info["address"]
-            network_prefix = ip_info["network_prefix"]
-            miner_net = MinerNetwork.from_subnet(f"{local_ip}/{network_prefix}")
-            miners = await miner_net.scan()
-            if len(miners) > 0:
-                return True
-    return False
+    return len(await async_get_discovery(hass).async_discover()) > 0
 
 
 register_discovery_flow(DOMAIN, "MinerMonitor", _async_has_devices)
@@ -62,6 +68,8 @@ async def validate_ip_input(
     data: dict[str, str]
 ) -> tuple[dict[str, str], pyasic.AnyMiner | None]:
     """Validate the user input allows us to connect."""
+    import pyasic
+
     miner_ip = data.get(CONF_IP)
 
     miner = await pyasic.get_miner(miner_ip)
@@ -71,6 +79,57 @@ async def validate_ip_input(
     return {}, miner
 
 
+async def async_get_miner_identity(
+    miner: pyasic.AnyMiner,
+) -> tuple[str | None, str | None]:
+    """Return the hostname and MAC of a miner in one round of requests."""
+    miner_data = await miner.get_data(include=["hostname", "mac"])
+    return miner_data.hostname, miner_data.mac
+
+
+def parse_bulk_hosts(text: str) -> list[str] | None:
+    """Return the hosts of a CIDR range or IP list, None for a single IP.
+
+    Raise ValueError if any part is invalid or too many hosts are given.
+    """
+    parts = [part for part in re.split(r"[\s,;]+", text) if part]
+    if len(parts) == 1 and "/" not in parts[0]:
+        return None
+
+    hosts: dict[str, None] = {}
+    for part in parts:
+        if "/" in part:
+            network = ipaddress.ip_network(part, strict=False)
+            if network.num_addresses > DEFAULT_BULK_MAX_HOSTS:
+                raise ValueError(f"{part} has too many hosts")
+            hosts.update(dict.fromkeys(str(host) for host in network.hosts()))
+        else:
+            hosts[str(ipaddress.ip_address(part))] = None
+        if len(hosts) > DEFAULT_BULK_MAX_HOSTS:
+            raise ValueError("Too many hosts")
+    return list(hosts)
+
+
+def credentials_with_defaults(
+    miner: pyasic.AnyMiner, credentials: dict[str, str]
+) -> dict[str, str]:
+    """Return shared credentials, using the miner defaults for blank ones."""
+    defaults = {}
+    if miner.rpc is not None and miner.rpc.pwd is not None:
+        defaults[CONF_RPC_PASSWORD] = miner.rpc.pwd
+    if miner.web is not None:
+        defaults[CONF_WEB_USERNAME] = miner.web.username
+        defaults[CONF_WEB_PASSWORD] = miner.web.pwd
+    if miner.ssh is not None:
+        defaults[CONF_SSH_USERNAME] = miner.ssh.username
+        defaults[CONF_SSH_PASSWORD] = miner.ssh.pwd
+    return {
+        key: credentials.get(key) or default
+        for key, default in defaults.items()
+        if credentials.get(key) or default is not None
+    }
+
+
 class MinerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Miner."""
 
@@ -80,20 +139,80 @@ class MinerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize."""
         self._data = {}
         self._miner = None
+        self._hostname: str | None = None
+        self._mac: str | None = None
+        self._discovered: dict[str, pyasic.AnyMiner] | None = None
+        self._scan_task: asyncio.Task | None = None
+        self._bulk_hosts: list[str] = []
+        self._bulk_credentials: dict[str, str] = {}
+        self._bulk_task: asyncio.Task | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return MinerOptionsFlow()
 
     async def async_step_user(self, user_input=None):
         """Get miner IP and check if it is available."""
+        if user_input is None and self._discovered is None:
+            discovery = async_get_discovery(self.hass)
+            # A shown progress step has to end with progress done, even
+            # though the finished scan has filled the cache by now.
+            if self._scan_task is None:
+                if (discovered := discovery.async_get_cached()) is not None:
+                    self._discovered = discovered
+                else:
+                    # Scan the local subnets while showing a progress spinner
+                    self._scan_task = self.hass.async_create_task(
+                        discovery.async_discover()
+                    )
+            if self._scan_task is not None:
+                if not self._scan_task.done():
+                    return self.async_show_progress(
+                        step_id="user",
+                        progress_action="scan",
+                        progress_task=self._scan_task,
+                    )
+                try:
+                    discovered = self._scan_task.result()
+                except Exception as err:
+                    _LOGGER.warning("Scanning for miners failed: %s", err)
+                    discovered = {}
+                self._discovered = discovered
+                return self.async_show_progress_done(next_step_id="user")
+
         if user_input is None:
             user_input = {}
 
+        configured = {
+            entry.data.get(CONF_IP) for entry in self._async_current_entries()
+        }
+        discovered_options = [
+            SelectOptionDict(value=ip, label=f"{ip} ({miner.make} {miner.raw_model})")
+            for ip, miner in sorted((self._discovered or {}).items())
+            if ip not in configured
+        ]
+        ip_selector = str
+        if discovered_options:
+            ip_selector = SelectSelector(
+                SelectSelectorConfig(
+                    options=discovered_options,
+                    custom_value=True,
+                    mode=SelectSelectorMode.DROPDOWN,
+                )
+            )
+
         schema = vol.Schema(
             {
-                vol.Required(CONF_IP, default=user_input.get(CONF_IP, "")): str,
-                vol.Optional(CONF_MIN_POWER, default=100): vol.All(
-                    vol.Coerce(int), vol.Range(min=100, max=10000)
+                vol.Required(CONF_IP, default=user_input.get(CONF_IP, "")): ip_selector,
+                vol.Optional(CONF_MIN_POWER, default=DEFAULT_MIN_POWER): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(min=DEFAULT_MIN_POWER, max=DEFAULT_MAX_POWER),
                 ),
-                vol.Optional(CONF_MAX_POWER, default=10000): vol.All(
-                    vol.Coerce(int), vol.Range(min=100, max=10000)
+                vol.Optional(CONF_MAX_POWER, default=DEFAULT_MAX_POWER): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(min=DEFAULT_MIN_POWER, max=DEFAULT_MAX_POWER),
                 ),
             }
         )
@@ -101,13 +220,45 @@ class MinerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if not user_input:
             return self.async_show_form(step_id="user", data_schema=schema)
 
-        errors, miner = await validate_ip_input(user_input)
+        try:
+            bulk_hosts = parse_bulk_hosts(user_input[CONF_IP])
+        except ValueError:
+            return self.async_show_form(
+                step_id="user",
+                data_schema=schema,
+                errors={"base": "Invalid IP address, IP list or range."},
+            )
+        if bulk_hosts is not None:
+            self._bulk_hosts = bulk_hosts
+            self._data.update(user_input)
+            return await self.async_step_bulk_login()
+
+        # Abort before any network call if the IP is already configured
+        self._async_abort_entries_match({CONF_IP: user_input[CONF_IP]})
+
+        await async_ensure_pyasic(self.hass)
+        if (miner := (self._discovered or {}).get(user_input[CONF_IP])) is not None:
+            # Already detected by the scan
+            errors = {}
+        else:
+            errors, miner = await validate_ip_input(user_input)
+
+        if not errors:
+            try:
+                self._hostname, self._mac = await async_get_miner_identity(miner)
+            except Exception as err:
+                _LOGGER.debug("Reading the identity of %s failed: %s", miner, err)
 
         if errors:
             return self.async_show_form(
                 step_id="user", data_schema=schema, errors=errors
             )
 
+        if self._mac is not None:
+            # The miner may be configured already under another IP
+            await self.async_set_unique_id(format_mac(self._mac))
+            self._abort_if_unique_id_configured(updates={CONF_IP: user_input[CONF_IP]})
+
         self._miner = miner
         self._data.update(user_input)
         return await self.async_step_login()
@@ -202,16 +353,18 @@ class MinerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._miner.ssh.username = self._data.get(CONF_SSH_USERNAME, "")
             self._miner.ssh.pwd = self._data.get(CONF_SSH_PASSWORD, "")
 
-        title = await self._miner.get_hostname()
-
         if user_input is None:
             user_input = {}
 
+        if not user_input and self._hostname is None:
+            # Some firmwares only report the hostname once logged in
+            self._hostname = await self._miner.get_hostname()
+
         data_schema = vol.Schema(
             {
                 vol.Required(
                     CONF_TITLE,
-                    default=user_input.get(CONF_TITLE, title),
+                    default=user_input.get(CONF_TITLE, self._hostname),
                 ): str,
             }
         )
@@ -220,4 +373,182 @@ class MinerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         self._data.update(user_input)
 
+        await self._async_cache_detection(
+            self._data[CONF_IP], self._miner, self._hostname, self._mac
+        )
         return self.async_create_entry(title=self._data[CONF_TITLE], data=self._data)
+
+    async def _async_cache_detection(
+        self,
+        ip: str,
+        miner: pyasic.AnyMiner,
+        hostname: str | None,
+        mac: str | None,
+    ) -> None:
+        """Store the detected miner so the entry setup doesn't detect it again."""
+        detection_cache = await async_get_detection_cache(self.hass)
+        detection_cache.async_update(ip, miner, hostname=hostname, mac=mac)
+
+    async def async_step_bulk_login(self, user_input=None):
+        """Get the credentials shared by all miners of a bulk add."""
+        if user_input is None:
+            password = TextSelector(
+                TextSelectorConfig(
+                    type=TextSelectorType.PASSWORD, autocomplete="current-password"
+                )
+            )
+            schema = vol.Schema(
+                {
+                    vol.Optional(CONF_RPC_PASSWORD): password,
+                    vol.Optional(CONF_WEB_USERNAME): str,
+                    vol.Optional(CONF_WEB_PASSWORD): password,
+                    vol.Optional(CONF_SSH_USERNAME): str,
+                    vol.Optional(CONF_SSH_PASSWORD): password,
+                }
+            )
+            return self.async_show_form(
+                step_id="bulk_login",
+                data_schema=schema,
+                description_placeholders={"hosts": str(len(self._bulk_hosts))},
+            )
+
+        self._bulk_credentials = user_input
+        return await self.async_step_bulk_add()
+
+    async def async_step_bulk_add(self, user_input=None):
+        """Detect and add all miners of a bulk add while showing progress."""
+        if self._bulk_task is None:
+            self._bulk_task = self.hass.async_create_task(self._async_bulk_add())
+        if not self._bulk_task.done():
+            return self.async_show_progress(
+                step_id="bulk_add",
+                progress_action="bulk_add",
+                progress_task=self._bulk_task,
+            )
+        return self.async_show_progress_done(next_step_id="bulk_report")
+
+    async def async_step_bulk_report(self, user_input=None):
+        """Report the result of a bulk add per IP."""
+        try:
+            results: dict[str, str] = self._bulk_task.result()
+        except Exception as err:
+            _LOGGER.exception(err)
+            return self.async_abort(reason="unknown")
+
+        added = sum(1 for result in results.values() if result == "added")
+        return self.async_abort(
+            reason="bulk_added",
+            description_placeholders={
+                "added": str(added),
+                "total": str(len(results)),
+                "report": "\n".join(
+                    f"- {ip}: {result}" for ip, result in results.items()
+                ),
+            },
+        )
+
+    async def _async_bulk_add(self) -> dict[str, str]:
+        """Detect the miners concurrently and create an entry for each."""
+        await async_ensure_pyasic(self.hass)
+
+        import pyasic
+
+        configured = {
+            entry.data.get(CONF_IP) for entry in self._async_current_entries()
+        }
+        discovered = self._discovered or {}
+        semaphore = asyncio.Semaphore(DEFAULT_BULK_CONCURRENCY)
+
+        async def _async_add(ip: str) -> str:
+            if ip in configured:
+                return "already configured"
+            async with semaphore:
+                try:
+                    miner = discovered.get(ip) or await pyasic.get_miner(ip)
+                    if miner is None:
+                        return "no miner found"
+                    title, mac = await async_get_miner_identity(miner)
+                except Exception as err:
+                    return f"failed: {err}"
+            await self._async_cache_detection(ip, miner, title, mac)
+
+            data = {
+                CONF_IP: ip,
+                CONF_MIN_POWER: self._data.get(CONF_MIN_POWER, DEFAULT_MIN_POWER),
+                CONF_MAX_POWER: self._data.get(CONF_MAX_POWER, DEFAULT_MAX_POWER),
+                **credentials_with_defaults(miner, self._bulk_credentials),
+                CONF_TITLE: title or ip,
+            }
+            result = await self.hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": config_entries.SOURCE_IMPORT, "mac": mac},
+                data=data,
+            )
+            if result["type"] is not FlowResultType.CREATE_ENTRY:
+                return result.get("reason", "not added")
+            return "added"
+
+        results = await asyncio.gather(*(_async_add(ip) for ip in self._bulk_hosts))
+        return dict(zip(self._bulk_hosts, results))
+
+    async def async_step_import(self, import_data):
+        """Create an entry for a miner detected by a bulk add."""
+        self._async_abort_entries_match({CONF_IP: import_data[CONF_IP]})
+        if (mac := self.context.get("mac")) is not None:
+            await self.async_set_unique_id(format_mac(mac))
+            self._abort_if_unique_id_configured(updates={CONF_IP: import_data[CONF_IP]})
+        return self.async_create_entry(title=import_data[CONF_TITLE], data=import_data)
+
+
+class MinerOptionsFlow(config_entries.OptionsFlow):
+    """Handle the polling options of a Miner."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the polling options."""
+        errors = {}
+        if user_input is not None:
+            if user_input.get(CONF_MIN_POLL_INTERVAL, 0) > user_input.get(
+                CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL
+            ):
+                errors["base"] = "Minimum poll interval is above the maximum."
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_REDETECT_INTERVAL,
+                    default=options.get(
+                        CONF_REDETECT_INTERVAL, DEFAULT_REDETECT_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                vol.Optional(
+                    CONF_SLOW_POLL_INTERVAL,
+                    default=options.get(
+                        CONF_SLOW_POLL_INTERVAL, DEFAULT_SLOW_POLL_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=86400)),
+                vol.Optional(
+                    CONF_ADAPTIVE_POLLING,
+                    default=options.get(CONF_ADAPTIVE_POLLING, False),
+                ): bool,
+                vol.Optional(
+                    CONF_MIN_POLL_INTERVAL,
+                    default=options.get(
+                        CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+                vol.Optional(
+                    CONF_MAX_POLL_INTERVAL,
+                    default=options.get(
+                        CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+                vol.Optional(
+                    CONF_USE_DEADBANDS,
+                    default=options.get(CONF_USE_DEADBANDS, False),
+                ): bool,
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
@@ -11,9 +11,77 @@ CONF_WEB_PASSWORD = "web_password"
 CONF_WEB_USERNAME = "web_username"
 CONF_MIN_POWER = "min_power"
 CONF_MAX_POWER = "max_power"
+CONF_REDETECT_INTERVAL = "redetect_interval"
+CONF_SLOW_POLL_INTERVAL = "slow_poll_interval"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_POLL_INTERVAL = "min_poll_interval"
+CONF_MAX_POLL_INTERVAL = "max_poll_interval"
+CONF_USE_DEADBANDS = "use_deadbands"
+
+DEFAULT_MIN_POWER = 100
+DEFAULT_MAX_POWER = 10000
+
+DEFAULT_POLL_INTERVAL = 10
+DEFAULT_MIN_POLL_INTERVAL = 5
+DEFAULT_MAX_POLL_INTERVAL = 60
+DEFAULT_REDETECT_INTERVAL = 3600
+DEFAULT_SLOW_POLL_INTERVAL = 300
+# Seconds to wait for more config changes before sending them at once
+DEFAULT_CONFIG_SEND_DELAY = 1
+# Seconds to wait for more power limit changes before writing the last one
+DEFAULT_POWER_LIMIT_DELAY = 1.5
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_BACKOFF_BASE = 30
+DEFAULT_BACKOFF_MAX = 900
+
+DATA_FLEET = f"{DOMAIN}_fleet"
+DATA_DETECTION_CACHE = f"{DOMAIN}_detection_cache"
+DATA_DISCOVERY = f"{DOMAIN}_discovery"
+DEFAULT_MAX_CONCURRENT_POLLS = 32
+DEFAULT_POLL_JITTER = 0.1
+# Polls finishing within this delay share one fleet aggregate update
+DEFAULT_FLEET_AGGREGATE_DELAY = 5
+
+# Hosts probed at the same time when scanning the local subnets
+DEFAULT_SCAN_CONCURRENCY = 256
+DEFAULT_SCAN_TTL = 300
+DEFAULT_SCAN_MIN_PREFIX = 16
+
+# Miners detected at the same time when adding a range or list of IPs
+DEFAULT_BULK_CONCURRENCY = 32
+DEFAULT_BULK_MAX_HOSTS = 4096
+
+# Idle web connections to miners are kept open for reuse this long
+DEFAULT_KEEPALIVE_EXPIRY = 60
+DEFAULT_KEEPALIVE_CONNECTIONS = 512
+
+# One day of five minute buckets
+DEFAULT_HISTORY_BUCKET = 300
+DEFAULT_HISTORY_CAPACITY = 288
+HISTORY_WINDOWS = {"1h": 3600, "24h": 86400}
+
+# Longer gaps between polls are not integrated into the energy total
+DEFAULT_ENERGY_MAX_GAP = 600
 
 SERVICE_REBOOT = "reboot"
 SERVICE_RESTART_BACKEND = "restart_backend"
+SERVICE_GET_FLEET_STATUS = "get_fleet_status"
+SERVICE_GET_CHIP_DATA = "get_chip_data"
+SERVICE_SET_POWER_BUDGET = "set_power_budget"
+
+ATTR_ALL = "all"
+ATTR_CONCURRENCY = "concurrency"
+ATTR_BATCH_SIZE = "batch_size"
+ATTR_BATCH_DELAY = "batch_delay"
+DEFAULT_SERVICE_CONCURRENCY = 16
+
+ATTR_POWER_BUDGET = "power_budget"
+ATTR_TIMEOUT = "timeout"
+DEFAULT_POWER_BUDGET_TIMEOUT = 120
+# Seconds between the polls of a miner waiting for its new power limit
+DEFAULT_POWER_BUDGET_SETTLE = 5
+DEFAULT_POWER_LIMIT_STEP = 100
 
 TERA_HASH_PER_SECOND = "TH/s"
 JOULES_PER_TERA_HASH = "J/TH"
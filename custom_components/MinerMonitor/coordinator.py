@@ -1,87 +1,595 @@
 """Miner DataUpdateCoordinator."""
+from __future__ import annotations
+
+import asyncio
+import copy
 import logging
+import time
+from collections.abc import Callable
 from datetime import timedelta
-from importlib.metadata import version
-
-from .const import PYASIC_VERSION
-
-try:
-    import pyasic
-
-    if not version("pyasic") == PYASIC_VERSION:
-        raise ImportError
-except ImportError:
-    from .patch import install_package
-
-    install_package(f"pyasic=={PYASIC_VERSION}")
-    import pyasic
+from typing import TYPE_CHECKING
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry
+from homeassistant.helpers import entity
 from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import (
+    CONF_ADAPTIVE_POLLING,
     CONF_IP,
+    CONF_MAX_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_REDETECT_INTERVAL,
     CONF_RPC_PASSWORD,
+    CONF_SLOW_POLL_INTERVAL,
     CONF_SSH_PASSWORD,
     CONF_SSH_USERNAME,
+    CONF_USE_DEADBANDS,
     CONF_WEB_PASSWORD,
     CONF_WEB_USERNAME,
+    DEFAULT_CONFIG_SEND_DELAY,
+    DEFAULT_ENERGY_MAX_GAP,
+    DEFAULT_REDETECT_INTERVAL,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_POWER_LIMIT_DELAY,
+    DEFAULT_SLOW_POLL_INTERVAL,
+    DOMAIN,
 )
+from .circuit_breaker import async_probe_miner
+from .circuit_breaker import BreakerState
+from .circuit_breaker import MinerCircuitBreaker
+from .detection_cache import MinerDetectionCache
+from .fleet import async_get_fleet_scheduler
+from .history import MinerHistory
+from .snapshot import MINER_SENSOR_KEYS
+from .snapshot import miner_sensor_accessor
+from .snapshot import MinerSnapshot
+from .snapshot import SnapshotAccessor
+
+if TYPE_CHECKING:
+    import pyasic
 
 _LOGGER = logging.getLogger(__name__)
 
 # Matches iotwatt data log interval
 REQUEST_REFRESH_DEFAULT_COOLDOWN = 5
 
+# Minimum change before an entity state is written when deadbands are enabled
+CHANGE_DEADBANDS = {
+    "hashrate": 0.1,
+    "board_hashrate": 0.1,
+    "temperature": 0.5,
+    "board_temperature": 0.5,
+    "chip_temperature": 0.5,
+    "env_temp": 0.5,
+    "miner_consumption": 5,
+    "efficiency": 0.1,
+    "percent_expected_hashrate": 0.5,
+    "fan_speed": 60,
+    "uptime": 60,
+}
+
+_CONSUMPTION = miner_sensor_accessor("miner_consumption")
+_POWER_LIMIT = miner_sensor_accessor("power_limit")
+_ERRORS = miner_sensor_accessor("errors")
+_HASHRATE = miner_sensor_accessor("hashrate")
+_TEMPERATURE = miner_sensor_accessor("temperature")
+
+# Adaptive polling thresholds
+ADAPTIVE_BACKOFF_FACTOR = 1.5
+ADAPTIVE_HOT_TEMPERATURE = 80
+ADAPTIVE_TEMPERATURE_DELTA = 2
+ADAPTIVE_HASHRATE_DELTA = 0.05
+
+# pyasic.DataOptions polled on every update
+FAST_DATA_OPTIONS = [
+    "is_mining",
+    "hashrate",
+    "hashboards",
+    "wattage",
+    "wattage_limit",
+    "fans",
+    "uptime",
+    "env_temp",
+    "fault_light",
+]
+
+# Miner methods reading one snapshot value for a partial refresh
+PARTIAL_REFRESH_GETTERS = {
+    "is_mining": "is_mining",
+    "power_limit": "get_wattage_limit",
+    "miner_consumption": "get_wattage",
+    "uptime": "get_uptime",
+    "fault_light": "get_fault_light",
+    "config": "get_config",
+}
+
+# Rarely changing data, polled on the slow interval and merged in between
+SLOW_DATA_OPTIONS = [
+    "hostname",
+    "mac",
+    "fw_ver",
+    "expected_hashrate",
+    "errors",
+    "config",
+]
 
-class MinerCoordinator(DataUpdateCoordinator):
+
+class MinerCoordinator(DataUpdateCoordinator[MinerSnapshot]):
     """Class to manage fetching update data from the Miner."""
 
-    miner: pyasic.AnyMiner = None
+    miner: pyasic.AnyMiner | None = None
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        miner: pyasic.AnyMiner | None = None,
+        detection_cache: MinerDetectionCache | None = None,
+        miner_cached: bool = False,
+    ) -> None:
+        """Initialize MinerCoordinator object.
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        """Initialize MinerCoordinator object."""
+        A miner that was already detected during setup, or built from the
+        detection cache, can be passed in to skip a second detection on the
+        first refresh.
+        """
         self.miner = None
+        self.detection_cache = detection_cache
+        self._verify_identity = False
+        self._miner_detected_at: float | None = None
+        self._redetect = False
+        self._slow_data: dict = {}
+        self._slow_polled_at: float | None = None
+        self._config_fetched_at: float | None = None
+        self._pending_config: pyasic.MinerConfig | None = None
+        self._config_task: asyncio.Task | None = None
+        self._config_lock = asyncio.Lock()
+        self.power_limit_target: int | None = None
+        self._pending_power_limit: int | None = None
+        self._power_limit_task: asyncio.Task | None = None
+        self._power_limit_lock = asyncio.Lock()
+        self._poll_interval = DEFAULT_POLL_INTERVAL
+        self.breaker = MinerCircuitBreaker()
+        self._notified_values: dict[SnapshotAccessor, object] = {}
+        self._notified_success: bool | None = None
+        self._device_info: entity.DeviceInfo | None = None
+        self._device_info_key: tuple | None = None
+        self.history: MinerHistory | None = None
+        self.energy = 0.0
+        self._energy_sample: tuple[float, float] | None = None
+        self._energy_restored = False
+        self.fleet = async_get_fleet_scheduler(hass)
+        # Polls are scheduled by the fleet scheduler, not by the coordinator
         super().__init__(
             hass=hass,
             logger=_LOGGER,
             config_entry=entry,
             name=entry.title,
-            update_interval=timedelta(seconds=10),
+            update_interval=None,
             request_refresh_debouncer=Debouncer(
                 hass, _LOGGER, cooldown=REQUEST_REFRESH_DEFAULT_COOLDOWN, immediate=True
             ),
         )
+        if miner is not None:
+            self._set_miner(miner, cached=miner_cached)
 
     @property
     def available(self):
         """Return if device is available or not."""
         return self.miner is not None
 
+    @property
+    def device_info(self) -> entity.DeviceInfo:
+        """Return the device info shared by all entities of the miner."""
+        if self._device_info is None:
+            self._device_info = self._build_device_info()
+        return self._device_info
+
+    def _build_device_info(self) -> entity.DeviceInfo:
+        """Build the device info from the identity of the miner."""
+        data = self.data
+        self._device_info_key = _device_identity(data)
+        return entity.DeviceInfo(
+            identifiers={(DOMAIN, data.mac)},
+            connections={
+                ("ip", data.ip),
+                (device_registry.CONNECTION_NETWORK_MAC, data.mac),
+            },
+            configuration_url=f"http://{data.ip}",
+            manufacturer=data.make,
+            model=data.model,
+            sw_version=data.fw_ver,
+            name=self.config_entry.title,
+        )
+
+    @callback
+    def _async_update_device_info(self) -> None:
+        """Rebuild the device info and registry entry if the identity changed."""
+        if (
+            self._device_info is None
+            or _device_identity(self.data) == self._device_info_key
+        ):
+            return
+        self._device_info = self._build_device_info()
+        device_registry.async_get(self.hass).async_get_or_create(
+            config_entry_id=self.config_entry.entry_id, **self._device_info
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Only notify the listeners whose data changed since the last update.
+
+        Entities pass the snapshot accessor of their value as listener context,
+        listeners without a context are always notified.
+        """
+        if self.data is not None:
+            self._async_update_device_info()
+        changed = self._async_changed_contexts()
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed:
+                update_callback()
+
+    @callback
+    def _async_changed_contexts(self) -> set[SnapshotAccessor]:
+        """Return the listener contexts whose value changed past its deadband."""
+        contexts = {
+            context
+            for _, context in self._listeners.values()
+            if isinstance(context, SnapshotAccessor)
+        }
+        notify_all = (
+            self.data is None or self.last_update_success is not self._notified_success
+        )
+        self._notified_success = self.last_update_success
+        use_deadbands = self.config_entry.options.get(CONF_USE_DEADBANDS, False)
+
+        changed = set()
+        for context in contexts:
+            value = context(self.data)
+            if (
+                notify_all
+                or context not in self._notified_values
+                or _value_changed(
+                    self._notified_values[context],
+                    value,
+                    CHANGE_DEADBANDS.get(context.key, 0) if use_deadbands else 0,
+                )
+            ):
+                self._notified_values[context] = value
+                changed.add(context)
+        return changed
+
+    @property
+    def poll_interval(self) -> timedelta:
+        """Return the time until the next scheduled poll."""
+        if self.breaker.state is BreakerState.OPEN:
+            # Sleep until the breaker allows the next probe
+            return timedelta(seconds=max(self.breaker.retry_in, self._poll_interval))
+        return timedelta(seconds=self._poll_interval)
+
+    def _adapt_poll_interval(
+        self, previous: MinerSnapshot | None, data: MinerSnapshot
+    ) -> None:
+        """Adapt the poll interval to the state and volatility of the miner.
+
+        Stopped or stable miners are polled less often, up to the maximum
+        interval, while hot or changing miners are polled at the minimum.
+        """
+        options = self.config_entry.options
+        if not options.get(CONF_ADAPTIVE_POLLING, False):
+            self._poll_interval = DEFAULT_POLL_INTERVAL
+            return
+
+        min_interval = options.get(CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL)
+        max_interval = options.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL)
+
+        if not data.is_mining:
+            self._poll_interval = max_interval
+            return
+
+        if previous is None or _is_volatile(previous, data):
+            self._poll_interval = min_interval
+            return
+
+        self._poll_interval = min(
+            max(self._poll_interval, min_interval) * ADAPTIVE_BACKOFF_FACTOR,
+            max_interval,
+        )
+
+    @property
+    def _redetect_due(self) -> bool:
+        """Return if the cached miner has to be detected again."""
+        if self.miner is None or self._redetect:
+            return True
+        redetect_interval = self.config_entry.options.get(
+            CONF_REDETECT_INTERVAL, DEFAULT_REDETECT_INTERVAL
+        )
+        return time.monotonic() - self._miner_detected_at >= redetect_interval
+
+    @property
+    def _slow_tier_due(self) -> bool:
+        """Return if the slow changing data has to be polled again."""
+        if self._slow_polled_at is None:
+            return True
+        slow_poll_interval = self.config_entry.options.get(
+            CONF_SLOW_POLL_INTERVAL, DEFAULT_SLOW_POLL_INTERVAL
+        )
+        return time.monotonic() - self._slow_polled_at >= slow_poll_interval
+
+    def _apply_credentials(self, miner: pyasic.AnyMiner) -> pyasic.AnyMiner:
+        """Apply the credentials of the config entry to a miner instance."""
+        if miner.api is not None:
+            if miner.api.pwd is not None:
+                miner.api.pwd = self.config_entry.data.get(CONF_RPC_PASSWORD, "")
+
+        if miner.web is not None:
+            miner.web.username = self.config_entry.data.get(CONF_WEB_USERNAME, "")
+            miner.web.pwd = self.config_entry.data.get(CONF_WEB_PASSWORD, "")
+
+        if miner.ssh is not None:
+            miner.ssh.username = self.config_entry.data.get(CONF_SSH_USERNAME, "")
+            miner.ssh.pwd = self.config_entry.data.get(CONF_SSH_PASSWORD, "")
+        return miner
+
+    def _set_miner(
+        self, miner: pyasic.AnyMiner, cached: bool = False
+    ) -> pyasic.AnyMiner:
+        """Cache a freshly detected miner instance."""
+        self.miner = self._apply_credentials(miner)
+        self._miner_detected_at = time.monotonic()
+        self._redetect = False
+        self._slow_polled_at = None
+        # A miner built from the detection cache is verified on the first poll
+        self._verify_identity = cached
+        if self.detection_cache is not None and not cached:
+            self.detection_cache.async_update(self.config_entry.data[CONF_IP], miner)
+        return self.miner
+
+    def _invalidate_miner(self, stale_identity: bool = False) -> None:
+        """Detect the miner again on the next poll.
+
+        The detection cache record of an unverified miner is only dropped
+        when its identity is known to be stale.
+        """
+        self._redetect = True
+        if (
+            stale_identity
+            and self._verify_identity
+            and self.detection_cache is not None
+        ):
+            self.detection_cache.async_remove(self.config_entry.data[CONF_IP])
+            self._verify_identity = False
+
+    async def _async_invalidate_failed_miner(self) -> None:
+        """Detect the miner again after a failed fetch.
+
+        A miner built from the detection cache that answers a probe but
+        fails as the cached class has a stale record, while an unreachable
+        one, e.g. powered off for curtailment, keeps its record.
+        """
+        stale_identity = False
+        if self._verify_identity:
+            stale_identity = await async_probe_miner(self.config_entry.data[CONF_IP])
+        self._invalidate_miner(stale_identity)
+
+    def _update_detection_cache(self, miner_data: pyasic.MinerData) -> None:
+        """Verify and store the identity of the miner in the detection cache."""
+        if self.detection_cache is None:
+            return
+
+        miner_ip = self.config_entry.data[CONF_IP]
+        if self._verify_identity:
+            cached_mac = (self.detection_cache.async_get(miner_ip) or {}).get("mac")
+            if (
+                cached_mac is not None
+                and miner_data.mac is not None
+                and cached_mac.upper() != miner_data.mac.upper()
+            ):
+                self._invalidate_miner(stale_identity=True)
+                # Entities may have been created from the stale identity
+                self.hass.config_entries.async_schedule_reload(
+                    self.config_entry.entry_id
+                )
+                raise UpdateFailed("Cached miner identity does not match")
+            self._verify_identity = False
+
+        self.detection_cache.async_update(
+            miner_ip,
+            self.miner,
+            mac=miner_data.mac,
+            fw_ver=miner_data.fw_ver,
+            hostname=miner_data.hostname,
+            board_slots=sorted(
+                board.slot
+                for board in miner_data.hashboards
+                if board.hashrate is not None
+            ),
+        )
+
+    @callback
+    def async_set_cached_data(self, record: dict) -> bool:
+        """Seed the coordinator with a cached identity until the first poll.
+
+        Return if the record was complete enough to create entities from.
+        """
+        if record.get("mac") is None or record.get("board_slots") is None:
+            return False
+
+        self.data = MinerSnapshot.from_cache(record, self.config_entry.data[CONF_IP])
+        return True
+
     async def get_miner(self):
-        """Get a valid Miner instance."""
+        """Get a valid Miner instance.
+
+        The detected miner is cached and only detected again after a failed
+        fetch or once the re-validation interval has passed.
+        """
+        if not self._redetect_due:
+            return self.miner
+
+        import pyasic
+
         miner_ip = self.config_entry.data[CONF_IP]
         miner = await pyasic.get_miner(miner_ip)
         if miner is None:
             return None
 
-        self.miner = miner
-        if self.miner.api is not None:
-            if self.miner.api.pwd is not None:
-                self.miner.api.pwd = self.config_entry.data.get(CONF_RPC_PASSWORD, "")
+        return self._set_miner(miner)
 
-        if self.miner.web is not None:
-            self.miner.web.username = self.config_entry.data.get(CONF_WEB_USERNAME, "")
-            self.miner.web.pwd = self.config_entry.data.get(CONF_WEB_PASSWORD, "")
+    @property
+    def _config_stale(self) -> bool:
+        """Return if the cached miner config has to be read again."""
+        if self._config_fetched_at is None or self._slow_data.get("config") is None:
+            return True
+        slow_poll_interval = self.config_entry.options.get(
+            CONF_SLOW_POLL_INTERVAL, DEFAULT_SLOW_POLL_INTERVAL
+        )
+        return time.monotonic() - self._config_fetched_at >= slow_poll_interval
 
-        if self.miner.ssh is not None:
-            self.miner.ssh.username = self.config_entry.data.get(CONF_SSH_USERNAME, "")
-            self.miner.ssh.pwd = self.config_entry.data.get(CONF_SSH_PASSWORD, "")
-        return self.miner
+    async def async_get_config(self) -> pyasic.MinerConfig:
+        """Return the miner config, only reading it again once it is stale."""
+        if self._config_stale:
+            config = await self.miner.get_config()
+            self._slow_data["config"] = config
+            self._config_fetched_at = time.monotonic()
+        return self._slow_data["config"]
+
+    async def async_update_config(
+        self, update: Callable[[pyasic.MinerConfig], None]
+    ) -> None:
+        """Apply a change to the miner config and send it.
+
+        Changes made within DEFAULT_CONFIG_SEND_DELAY of each other are
+        applied to the same config and sent once, all callers wait for it.
+        """
+        if self._pending_config is None:
+            config = copy.deepcopy(await self.async_get_config())
+            if self._pending_config is None:
+                self._pending_config = config
+        update(self._pending_config)
+        if self._config_task is None:
+            self._config_task = self.hass.async_create_task(self._async_send_config())
+        await asyncio.shield(self._config_task)
+
+    async def _async_send_config(self) -> None:
+        """Send the pending config once the changes have settled."""
+        await asyncio.sleep(DEFAULT_CONFIG_SEND_DELAY)
+        config = self._pending_config
+        # Changes from now on go into the next send and start from this
+        # config, so they cannot revert it
+        self._pending_config = None
+        self._config_task = None
+        previous = self._slow_data.get("config")
+        self._slow_data["config"] = config
+        self._config_fetched_at = time.monotonic()
+        # Sends are made in order, a later batch waits for this one
+        async with self._config_lock:
+            try:
+                await self.miner.send_config(config)
+            except Exception:
+                # Polls merge the cached config, so do not show the rejected
+                # one and read the config on the miner on the next poll
+                if self._slow_data.get("config") is config:
+                    self._slow_data["config"] = previous
+                self._config_fetched_at = None
+                self._slow_polled_at = None
+                raise
+        if self.data is not None:
+            self.data.config = config
+            self.async_update_listeners()
+
+    async def async_set_power_limit(self, wattage: int) -> int | None:
+        """Set the power limit, only writing the last of rapid changes.
+
+        The target is kept in power_limit_target until it is written, then
+        the applied limit is read back, published and returned.
+        """
+        self.power_limit_target = self._pending_power_limit = wattage
+        if self._power_limit_task is None:
+            self._power_limit_task = self.hass.async_create_task(
+                self._async_write_power_limit()
+            )
+        return await asyncio.shield(self._power_limit_task)
+
+    async def _async_write_power_limit(self) -> int | None:
+        """Write the pending power limit and read back the applied one."""
+        await asyncio.sleep(DEFAULT_POWER_LIMIT_DELAY)
+        wattage = self._pending_power_limit
+        # Changes from now on go into the next write
+        self._power_limit_task = None
+        # Writes are made in order, a later write waits for this one
+        async with self._power_limit_lock:
+            try:
+                if not await self.miner.set_power_limit(wattage):
+                    from pyasic import APIError
+
+                    raise APIError("Failed to set wattage.")
+            finally:
+                # A newer target stays pending for its own write
+                if self.power_limit_target == wattage:
+                    self.power_limit_target = None
+            await self.async_refresh_fields("power_limit")
+            return _POWER_LIMIT(self.data)
+
+    async def async_refresh_fields(self, *keys: str) -> None:
+        """Read only some values and merge them into the current snapshot.
+
+        Used right after a control action to publish its result without a
+        full poll.  Values that cannot be read keep their previous value.
+        """
+        if self.miner is None or self.data is None:
+            return
+        values = await asyncio.gather(
+            *(getattr(self.miner, PARTIAL_REFRESH_GETTERS[key])() for key in keys),
+            return_exceptions=True,
+        )
+        for key, value in zip(keys, values):
+            if isinstance(value, Exception):
+                _LOGGER.debug("%s: refreshing %s failed: %s", self.name, key, value)
+                continue
+            if value is None:
+                continue
+            if key in MINER_SENSOR_KEYS:
+                self.data.set_miner_value(key, value)
+            else:
+                setattr(self.data, key, value)
+            if key == "config":
+                self._slow_data["config"] = value
+                self._config_fetched_at = time.monotonic()
+        self.async_update_listeners()
 
     async def _async_update_data(self):
+        """Fetch sensors from miners within a fleet request slot.
+
+        Offline miners are not polled while the circuit breaker is open, and
+        only a cheap connection probe is made once it goes half-open.
+        """
+        if not self.breaker.allow_request():
+            raise UpdateFailed(
+                f"Miner Offline, next probe in {self.breaker.retry_in:.0f}s"
+            )
+
+        async with self.fleet.poll_slot():
+            if self.breaker.state is BreakerState.HALF_OPEN:
+                if not await async_probe_miner(self.config_entry.data[CONF_IP]):
+                    self.breaker.record_failure()
+                    raise UpdateFailed("Miner Offline")
+            try:
+                data = await self._async_fetch_data()
+            except UpdateFailed:
+                self.breaker.record_failure()
+                raise
+
+        self.breaker.record_success()
+        return data
+
+    async def _async_fetch_data(self):
         """Fetch sensors from miners."""
         miner = await self.get_miner()
 
@@ -90,79 +598,125 @@ class MinerCoordinator(DataUpdateCoordinator):
 
         _LOGGER.debug(f"Found miner: {self.miner}")
 
+        slow_tier_due = self._slow_tier_due
+        include = FAST_DATA_OPTIONS
+        if slow_tier_due:
+            include = FAST_DATA_OPTIONS + SLOW_DATA_OPTIONS
+
         try:
-            miner_data = await self.miner.get_data(
-                include=[
-                    pyasic.DataOptions.HOSTNAME,
-                    pyasic.DataOptions.MAC,
-                    pyasic.DataOptions.IS_MINING,
-                    pyasic.DataOptions.FW_VERSION,
-                    pyasic.DataOptions.HASHRATE,
-                    pyasic.DataOptions.EXPECTED_HASHRATE,
-                    pyasic.DataOptions.HASHBOARDS,
-                    pyasic.DataOptions.WATTAGE,
-                    pyasic.DataOptions.WATTAGE_LIMIT,
-                    pyasic.DataOptions.FANS,
-                    pyasic.DataOptions.UPTIME,
-                    pyasic.DataOptions.ENVIRONMENT_TEMP,
-                    pyasic.DataOptions.ERRORS,
-                    pyasic.DataOptions.FAULT_LIGHT,
-                ]
-            )
+            miner_data = await self.miner.get_data(include=include)
         except Exception as err:
             _LOGGER.exception(err)
+            # The firmware or backend may have changed, detect again next poll.
+            await self._async_invalidate_failed_miner()
             raise UpdateFailed from err
 
         _LOGGER.debug(f"Got data: {miner_data}")
 
-        try:
-            hashrate = round(float(miner_data.hashrate), 2)
-        except (TypeError, ValueError):
-            hashrate = None
+        if (
+            miner_data.hashrate is None
+            and miner_data.wattage is None
+            and miner_data.uptime is None
+        ):
+            # Nothing came back, the miner is offline or the cached miner
+            # class no longer matches the device.
+            await self._async_invalidate_failed_miner()
+            raise UpdateFailed("Miner returned no data")
 
-        try:
-            expected_hashrate = round(float(miner_data.expected_hashrate), 2)
-        except (TypeError, ValueError):
-            expected_hashrate = None
-
-        # Process errors into a string for sensor display
-        if miner_data.errors:
-            errors_str = "; ".join(getattr(e, "error_message", str(e)) for e in miner_data.errors) or "No errors"
+        if slow_tier_due:
+            self._slow_data = {
+                option: getattr(miner_data, option) for option in SLOW_DATA_OPTIONS
+            }
+            self._slow_polled_at = self._config_fetched_at = time.monotonic()
+            self._update_detection_cache(miner_data)
         else:
-            errors_str = ""
-
-        data = {
-            "hostname": miner_data.hostname,
-            "mac": miner_data.mac,
-            "make": miner_data.make,
-            "model": miner_data.model,
-            "ip": self.miner.ip,
-            "is_mining": miner_data.is_mining,
-            "fw_ver": miner_data.fw_ver,
-            "miner_sensors": {
-                "hashrate": hashrate,
-                "ideal_hashrate": expected_hashrate,
-                "temperature": miner_data.temperature_avg,
-                "power_limit": miner_data.wattage_limit,
-                "miner_consumption": miner_data.wattage,
-                "efficiency": miner_data.efficiency,
-                "percent_expected_hashrate": miner_data.percent_expected_hashrate,
-                "uptime": miner_data.uptime,
-                "env_temp": miner_data.env_temp,
-                "errors": errors_str,
-                "fault_light": miner_data.fault_light,
-            },
-            "board_sensors": {
-                board.slot: {
-                    "board_temperature": board.temp,
-                    "chip_temperature": board.chip_temp,
-                    "board_hashrate": round(float(board.hashrate or 0), 2),
-                }
-                for board in miner_data.hashboards if board.hashrate is not None
-            },
-            "fan_sensors": {
-                idx: {"fan_speed": fan.speed} for idx, fan in enumerate(miner_data.fans)
-            },
-            "config": miner_data.config,
-        }
-        return data
\ No newline at end of file
+            # Merge the cached identity, config and errors into the fast snapshot.
+            for key, value in self._slow_data.items():
+                setattr(miner_data, key, value)
+
+        data = MinerSnapshot.from_miner_data(miner_data, self.miner.ip)
+        self._record_history(data)
+        self._integrate_energy(_CONSUMPTION(data))
+        self._adapt_poll_interval(self.data, data)
+        return data
+
+    def _integrate_energy(self, wattage: float | None) -> None:
+        """Add the energy used since the previous poll, in kWh.
+
+        The trapezoid between two polls is integrated unless they are more
+        than DEFAULT_ENERGY_MAX_GAP apart, the draw during such a gap is
+        unknown.
+        """
+        if wattage is None:
+            return
+        now = time.monotonic()
+        if self._energy_sample is not None:
+            sampled_at, previous = self._energy_sample
+            if (elapsed := now - sampled_at) <= DEFAULT_ENERGY_MAX_GAP:
+                self.energy += (previous + wattage) / 2 * elapsed / 3_600_000
+        self._energy_sample = (now, wattage)
+
+    @callback
+    def async_restore_energy(self, energy: float) -> None:
+        """Continue the energy total from before a restart."""
+        if self._energy_restored:
+            return
+        self._energy_restored = True
+        # Energy may already have been integrated by the first polls
+        self.energy += energy
+
+    def _record_history(self, data: MinerSnapshot) -> None:
+        """Add a poll to the telemetry history."""
+        if self.history is None:
+            # Also reserve the expected boards in case one is down right now
+            self.history = MinerHistory(
+                board_slots=[
+                    *data.board_slots,
+                    *range(self.miner.expected_hashboards or 0),
+                ]
+            )
+        self.history.record(data)
+
+
+def _value_changed(previous, current, deadband: float) -> bool:
+    """Return if a value changed by more than its deadband."""
+    if (
+        deadband
+        and isinstance(previous, int | float)
+        and isinstance(current, int | float)
+        and not isinstance(previous, bool)
+        and not isinstance(current, bool)
+    ):
+        return abs(current - previous) >= deadband
+    return previous != current
+
+
+def _device_identity(data: MinerSnapshot) -> tuple:
+    """Return the values the device info is built from."""
+    return (data.mac, data.ip, data.make, data.model, data.fw_ver)
+
+
+def _is_volatile(previous: MinerSnapshot, current: MinerSnapshot) -> bool:
+    """Return if temperatures, hashrate or errors are moving or too hot."""
+    temperature = _TEMPERATURE(current)
+    if temperature is not None and temperature >= ADAPTIVE_HOT_TEMPERATURE:
+        return True
+
+    if _ERRORS(previous) != _ERRORS(current):
+        return True
+
+    previous_temperature = _TEMPERATURE(previous)
+    if temperature is not None and previous_temperature is not None:
+        if abs(temperature - previous_temperature) >= ADAPTIVE_TEMPERATURE_DELTA:
+            return True
+
+    hashrate = _HASHRATE(current)
+    previous_hashrate = _HASHRATE(previous)
+    if (hashrate is None) != (previous_hashrate is None):
+        return True
+    if hashrate is not None and previous_hashrate:
+        change = abs(hashrate - previous_hashrate) / previous_hashrate
+        if change >= ADAPTIVE_HASHRATE_DELTA:
+            return True
+
+    return False
@@ -0,0 +1,123 @@
+"""Persistent cache of detected miners for fast restarts."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_DETECTION_CACHE
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    import pyasic
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.detection_cache"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+
+async def async_get_detection_cache(hass: HomeAssistant) -> MinerDetectionCache:
+    """Return the loaded detection cache, creating it on first use."""
+    if DATA_DETECTION_CACHE not in hass.data:
+        hass.data[DATA_DETECTION_CACHE] = MinerDetectionCache(hass)
+    cache: MinerDetectionCache = hass.data[DATA_DETECTION_CACHE]
+    await cache.async_load()
+    return cache
+
+
+def _miner_class_key(miner: pyasic.AnyMiner) -> tuple[str, str | None] | None:
+    """Return the factory type and model key that build this miner class."""
+    from pyasic.miners.factory import MINER_CLASSES
+
+    miner_cls = type(miner)
+    for miner_type, classes in MINER_CLASSES.items():
+        for model, cls in classes.items():
+            if cls is miner_cls:
+                return miner_type.name, model
+    return None
+
+
+class MinerDetectionCache:
+    """Store the identity and capabilities of detected miners by IP.
+
+    A miner can be built straight from a cached record without running the
+    pyasic detection, the coordinator verifies the MAC on the first poll.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the detection cache."""
+        self.hass = hass
+        self._store: Store[dict[str, dict]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._data: dict[str, dict] = {}
+        self._load_task: asyncio.Task | None = None
+
+    async def async_load(self) -> None:
+        """Load the cache from storage once."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        """Read the stored records."""
+        self._data = await self._store.async_load() or {}
+
+    @callback
+    def async_get(self, ip: str) -> dict | None:
+        """Return the cached record of a miner."""
+        return self._data.get(ip)
+
+    @callback
+    def async_build_miner(self, ip: str) -> pyasic.AnyMiner | None:
+        """Build a miner instance from the cache without detecting it."""
+        from pyasic.miners.factory import MINER_CLASSES
+        from pyasic.miners.factory import MinerTypes
+
+        if (record := self._data.get(ip)) is None:
+            return None
+        try:
+            miner_cls = MINER_CLASSES[MinerTypes[record["miner_type"]]][
+                record["model_key"]
+            ]
+        except LookupError:
+            _LOGGER.debug("Stale detection cache for %s: %s", ip, record)
+            self.async_remove(ip)
+            return None
+        return miner_cls(ip)
+
+    @callback
+    def async_update(self, ip: str, miner: pyasic.AnyMiner, **identity) -> None:
+        """Record a detected miner and any identity learned from polling."""
+        if (class_key := _miner_class_key(miner)) is None:
+            # Unknown miners can't be rebuilt without detection
+            return
+
+        miner_type, model_key = class_key
+        record = {
+            **self._data.get(ip, {}),
+            "miner_type": miner_type,
+            "model_key": model_key,
+            "make": str(miner.make) if miner.make is not None else None,
+            "model": str(miner.raw_model) if miner.raw_model is not None else None,
+            "firmware": str(miner.firmware) if miner.firmware is not None else None,
+            "supports_autotuning": miner.supports_autotuning,
+            "supports_shutdown": miner.supports_shutdown,
+            "supports_power_modes": miner.supports_power_modes,
+            "expected_fans": miner.expected_fans,
+            **{key: value for key, value in identity.items() if value is not None},
+        }
+        if self._data.get(ip) == record:
+            return
+        self._data[ip] = record
+        self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, ip: str) -> None:
+        """Forget a cached miner."""
+        if self._data.pop(ip, None) is not None:
+            self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
@@ -0,0 +1,124 @@
+"""Concurrent discovery of miners on the local subnets."""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.components import network
+from homeassistant.core import callback
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_DISCOVERY
+from .const import DEFAULT_SCAN_CONCURRENCY
+from .const import DEFAULT_SCAN_MIN_PREFIX
+from .const import DEFAULT_SCAN_TTL
+from .patch import async_ensure_pyasic
+
+if TYPE_CHECKING:
+    import pyasic
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_discovery(hass: HomeAssistant) -> MinerDiscovery:
+    """Return the miner discovery, creating it on first use."""
+    if DATA_DISCOVERY not in hass.data:
+        hass.data[DATA_DISCOVERY] = MinerDiscovery(hass)
+    return hass.data[DATA_DISCOVERY]
+
+
+class MinerDiscovery:
+    """Scan all local subnets at once and keep the results for a while.
+
+    Every host of every subnet shares one bounded pool of probes, so large
+    networks are scanned concurrently without opening thousands of
+    connections at the same time.  Callers during a scan wait for the same
+    result.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+        ttl: float = DEFAULT_SCAN_TTL,
+    ) -> None:
+        """Initialize the miner discovery."""
+        self.hass = hass
+        self.concurrency = concurrency
+        self.ttl = ttl
+        self._miners: dict[str, pyasic.AnyMiner] = {}
+        self._scanned_at: float | None = None
+        self._scan_task: asyncio.Task | None = None
+
+    @callback
+    def async_get_cached(self) -> dict[str, pyasic.AnyMiner] | None:
+        """Return the miners of the last scan if it is still fresh."""
+        if self._scanned_at is None or time.monotonic() - self._scanned_at > self.ttl:
+            return None
+        return self._miners
+
+    async def async_discover(self) -> dict[str, pyasic.AnyMiner]:
+        """Return the discovered miners by IP, scanning if required."""
+        if (miners := self.async_get_cached()) is not None:
+            return miners
+        if self._scan_task is None:
+            self._scan_task = self.hass.async_create_background_task(
+                self._async_scan(), name="MinerMonitor subnet scan"
+            )
+        try:
+            return await asyncio.shield(self._scan_task)
+        finally:
+            if self._scan_task.done():
+                self._scan_task = None
+
+    async def _async_scan(self) -> dict[str, pyasic.AnyMiner]:
+        """Scan the hosts of all subnets in one bounded pool."""
+        await async_ensure_pyasic(self.hass)
+
+        from pyasic import MinerNetwork
+
+        hosts = await self._async_get_hosts()
+        miner_net = MinerNetwork(sorted(hosts))
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _scan_host(host) -> pyasic.AnyMiner | None:
+            async with semaphore:
+                try:
+                    return await miner_net.ping_and_get_miner(host)
+                except Exception as err:
+                    _LOGGER.debug("Scanning %s failed: %s", host, err)
+                    return None
+
+        started = time.monotonic()
+        miners = await asyncio.gather(*(_scan_host(host) for host in hosts))
+        self._miners = {str(miner.ip): miner for miner in miners if miner is not None}
+        self._scanned_at = time.monotonic()
+        _LOGGER.debug(
+            "Scanned %s hosts in %.1fs, found %s miners",
+            len(hosts),
+            self._scanned_at - started,
+            len(self._miners),
+        )
+        return self._miners
+
+    async def _async_get_hosts(self) -> set[ipaddress.IPv4Address]:
+        """Return the hosts of the subnets of all enabled adapters."""
+        hosts: set[ipaddress.IPv4Address] = set()
+        for adapter in await network.async_get_adapters(self.hass):
+            if not adapter["enabled"]:
+                continue
+            for ip_info in adapter["ipv4"]:
+                subnet = ipaddress.ip_network(
+                    f"{ip_info['address']}/{ip_info['network_prefix']}", strict=False
+                )
+                if subnet.is_loopback or subnet.is_link_local:
+                    continue
+                if subnet.prefixlen < DEFAULT_SCAN_MIN_PREFIX:
+                    _LOGGER.warning("Not scanning %s, the subnet is too large", subnet)
+                    continue
+                hosts.update(subnet.hosts())
+        return hosts
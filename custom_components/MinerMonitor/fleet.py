@@ -0,0 +1,314 @@
+"""Fleet wide poll scheduler for all Miner coordinators."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from collections.abc import Callable
+from collections.abc import Collection
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+import numpy as np
+from homeassistant.core import callback
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.event import async_call_later
+
+from .const import DATA_FLEET
+from .const import DEFAULT_FLEET_AGGREGATE_DELAY
+from .const import DEFAULT_MAX_CONCURRENT_POLLS
+from .const import DEFAULT_POLL_JITTER
+from .const import DOMAIN
+from .snapshot import attribute_accessor
+from .snapshot import BOARD_SENSOR_KEYS
+from .snapshot import miner_sensor_accessor
+
+if TYPE_CHECKING:
+    from .coordinator import MinerCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Window used to compute the achieved poll rate
+POLL_RATE_WINDOW = 60
+
+# Low discrepancy sequence so miners are spread over the interval
+# without knowing how many will be added
+_GOLDEN_RATIO = 0.6180339887498949
+
+_HASHRATE = miner_sensor_accessor("hashrate")
+_CONSUMPTION = miner_sensor_accessor("miner_consumption")
+_IS_MINING = attribute_accessor("is_mining")
+_BOARD_TEMPERATURE = BOARD_SENSOR_KEYS.index("board_temperature")
+
+
+@callback
+def async_get_fleet_scheduler(hass: HomeAssistant) -> MinerFleetScheduler:
+    """Return the fleet scheduler, creating it on first use."""
+    if DATA_FLEET not in hass.data:
+        hass.data[DATA_FLEET] = MinerFleetScheduler(hass)
+    return hass.data[DATA_FLEET]
+
+
+class MinerFleetScheduler:
+    """Spread the polls of all miners and cap the requests in flight."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_POLLS,
+        jitter: float = DEFAULT_POLL_JITTER,
+    ) -> None:
+        """Initialize the fleet scheduler."""
+        self.hass = hass
+        self.max_concurrent = max_concurrent
+        self.jitter = jitter
+        self.coordinators: dict[str, MinerCoordinator] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._scheduled: dict[str, Callable[[], None]] = {}
+        self._slot_index = 0
+        self._waiting = 0
+        self._in_flight = 0
+        self._completed: deque[float] = deque()
+        self.aggregates: dict = {}
+        self._aggregate_listeners: list[Callable[[], None]] = []
+        self._aggregate_scheduled: Callable[[], None] | None = None
+        self._entity_platforms: dict[str, Callable[[], None]] = {}
+        self._entity_owner: str | None = None
+
+    @property
+    def device_info(self) -> entity.DeviceInfo:
+        """Return the device info of the fleet aggregate sensors."""
+        return entity.DeviceInfo(
+            identifiers={(DOMAIN, "fleet")},
+            name="Miner Fleet",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of polls waiting for a free slot."""
+        return self._waiting
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of polls currently talking to a miner."""
+        return self._in_flight
+
+    @property
+    def poll_rate(self) -> float:
+        """Return the achieved polls per minute over the last window."""
+        self._prune_completed(time.monotonic())
+        return round(len(self._completed) * 60 / POLL_RATE_WINDOW, 2)
+
+    def as_dict(self) -> dict:
+        """Return the scheduler statistics."""
+        return {
+            "miners": len(self.coordinators),
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "poll_rate": self.poll_rate,
+            **self.aggregates,
+        }
+
+    @callback
+    def async_add_coordinator(
+        self, coordinator: MinerCoordinator
+    ) -> Callable[[], None]:
+        """Hand the polling of a coordinator to the fleet.
+
+        The first poll is placed on the next free slot of the interval so
+        miners don't fire in synchronized bursts.
+        """
+        entry_id = coordinator.config_entry.entry_id
+        self.coordinators[entry_id] = coordinator
+
+        self._slot_index += 1
+        offset = (self._slot_index * _GOLDEN_RATIO) % 1
+        self._schedule(entry_id, coordinator.poll_interval.total_seconds() * offset)
+
+        @callback
+        def _async_remove() -> None:
+            self.coordinators.pop(entry_id, None)
+            if (cancel := self._scheduled.pop(entry_id, None)) is not None:
+                cancel()
+            self._async_schedule_aggregate()
+
+        return _async_remove
+
+    @callback
+    def async_add_entity_platform(
+        self, entry_id: str, add_fleet_entities: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Register a sensor platform that can host the fleet entities.
+
+        The fleet entities are added by a single config entry.  When that
+        entry is unloaded they are handed over to the next registered one.
+        """
+        self._entity_platforms[entry_id] = add_fleet_entities
+        if self._entity_owner is None:
+            self._entity_owner = entry_id
+            add_fleet_entities()
+
+        @callback
+        def _async_remove() -> None:
+            self._entity_platforms.pop(entry_id, None)
+            if self._entity_owner != entry_id:
+                return
+            self._entity_owner = None
+            # The entities of the old owner are removed with its platform
+            for next_entry_id, add_entities in self._entity_platforms.items():
+                self._entity_owner = next_entry_id
+                add_entities()
+                break
+
+        return _async_remove
+
+    @callback
+    def async_add_aggregate_listener(
+        self, update_callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Listen for updates of the fleet aggregates."""
+        self._aggregate_listeners.append(update_callback)
+
+        @callback
+        def _async_remove() -> None:
+            self._aggregate_listeners.remove(update_callback)
+
+        return _async_remove
+
+    @callback
+    def _async_schedule_aggregate(self) -> None:
+        """Coalesce the polls of a cycle into one aggregate update."""
+        if self._aggregate_scheduled is not None:
+            return
+
+        @callback
+        def _async_aggregate_due(_now) -> None:
+            self._aggregate_scheduled = None
+            self.aggregates = fleet_aggregates(list(self.coordinators.values()))
+            for update_callback in list(self._aggregate_listeners):
+                update_callback()
+
+        self._aggregate_scheduled = async_call_later(
+            self.hass, DEFAULT_FLEET_AGGREGATE_DELAY, _async_aggregate_due
+        )
+
+    @asynccontextmanager
+    async def poll_slot(self) -> AsyncIterator[None]:
+        """Hold one of the fleet wide request slots."""
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+            now = time.monotonic()
+            self._completed.append(now)
+            self._prune_completed(now)
+
+    def _prune_completed(self, now: float) -> None:
+        """Forget completed polls outside of the rate window."""
+        while self._completed and now - self._completed[0] > POLL_RATE_WINDOW:
+            self._completed.popleft()
+
+    @callback
+    def _schedule(self, entry_id: str, delay: float) -> None:
+        """Schedule the next poll of a coordinator."""
+        if (cancel := self._scheduled.pop(entry_id, None)) is not None:
+            cancel()
+
+        @callback
+        def _async_poll_due(_now) -> None:
+            self._scheduled.pop(entry_id, None)
+            if entry_id not in self.coordinators:
+                return
+            self.hass.async_create_background_task(
+                self._async_poll(entry_id),
+                name=f"MinerMonitor poll {entry_id}",
+                eager_start=True,
+            )
+
+        self._scheduled[entry_id] = async_call_later(
+            self.hass, max(delay, 0), _async_poll_due
+        )
+
+    async def _async_poll(self, entry_id: str) -> None:
+        """Refresh a coordinator and schedule its next poll."""
+        coordinator = self.coordinators[entry_id]
+        try:
+            await coordinator.async_refresh()
+        finally:
+            self._async_schedule_aggregate()
+            # The entry may have been unloaded or reloaded during the poll
+            if self.coordinators.get(entry_id) is coordinator:
+                interval = coordinator.poll_interval.total_seconds()
+                jitter = random.uniform(-self.jitter, self.jitter)
+                self._schedule(entry_id, interval * (1 + jitter))
+
+
+def fleet_aggregates(coordinators: Collection[MinerCoordinator]) -> dict:
+    """Compute the fleet aggregates in one vectorized pass over the snapshots.
+
+    Miners count as offline while their last poll failed.
+    """
+    online = [
+        coordinator
+        for coordinator in coordinators
+        if coordinator.last_update_success and coordinator.data is not None
+    ]
+    snapshots = [coordinator.data for coordinator in online]
+    hashrate = np.array([_HASHRATE(data) for data in snapshots], dtype=np.float64)
+    power = np.array([_CONSUMPTION(data) for data in snapshots], dtype=np.float64)
+    is_mining = np.array(
+        [_IS_MINING(data) is True for data in snapshots], dtype=np.bool_
+    )
+    # One row per board, tagged with the index of its miner
+    board_temperature = np.array(
+        [
+            (values[_BOARD_TEMPERATURE], idx)
+            for idx, data in enumerate(snapshots)
+            for values in data.board_values.values()
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+
+    # Efficiency only counts miners that report both values
+    both = ~np.isnan(hashrate) & ~np.isnan(power)
+    total_hashrate = float(np.nansum(hashrate))
+    efficiency = None
+    if (both_hashrate := hashrate[both].sum()) > 0:
+        efficiency = round(float(power[both].sum() / both_hashrate), 2)
+
+    hottest_board = None
+    hottest_miner = None
+    temperatures = board_temperature[:, 0]
+    if not np.isnan(temperatures).all():
+        hottest = int(np.nanargmax(temperatures))
+        hottest_board = float(temperatures[hottest])
+        hottest_miner = online[int(board_temperature[hottest, 1])].config_entry.title
+
+    return {
+        "total_hashrate": round(total_hashrate, 2),
+        "average_hashrate": (
+            round(float(np.nanmean(hashrate)), 2)
+            if not np.isnan(hashrate).all()
+            else None
+        ),
+        "total_power": round(float(np.nansum(power)), 2),
+        "efficiency": efficiency,
+        "miners_mining": int(is_mining.sum()),
+        "miners_offline": len(coordinators) - len(online),
+        "hottest_board": hottest_board,
+        "hottest_miner": hottest_miner,
+    }
@@ -0,0 +1,128 @@
+"""In-memory telemetry history of a miner with rolling statistics."""
+from __future__ import annotations
+
+import time
+import warnings
+from collections.abc import Iterable
+
+import numpy as np
+
+from .const import DEFAULT_HISTORY_BUCKET
+from .const import DEFAULT_HISTORY_CAPACITY
+from .snapshot import board_sensor_accessor
+from .snapshot import BOARD_SENSOR_KEYS
+from .snapshot import miner_sensor_accessor
+from .snapshot import MinerSnapshot
+from .snapshot import SnapshotAccessor
+
+# Numeric miner sensors recorded on every poll
+HISTORY_MINER_KEYS = (
+    "hashrate",
+    "temperature",
+    "miner_consumption",
+    "efficiency",
+    "percent_expected_hashrate",
+    "env_temp",
+)
+
+STATISTICS = ("mean", "min", "max", "p95")
+
+
+class MinerHistory:
+    """Fixed size ring buffer of the per bucket telemetry of one miner.
+
+    Polls are summed into buckets of a fixed length, so the memory use only
+    depends on the capacity and the number of recorded values, not on the
+    poll interval.  The mean of a window is taken over all polls, min, max
+    and p95 over the bucket means.
+    """
+
+    def __init__(
+        self,
+        board_slots: Iterable[int],
+        capacity: int = DEFAULT_HISTORY_CAPACITY,
+        bucket: int = DEFAULT_HISTORY_BUCKET,
+    ) -> None:
+        """Initialize the history."""
+        self.capacity = capacity
+        self.bucket = bucket
+        self._accessors: list[SnapshotAccessor] = [
+            miner_sensor_accessor(key) for key in HISTORY_MINER_KEYS
+        ]
+        self._accessors.extend(
+            board_sensor_accessor(slot, key)
+            for slot in sorted(set(board_slots))
+            for key in BOARD_SENSOR_KEYS
+        )
+        self._columns = {
+            accessor: column for column, accessor in enumerate(self._accessors)
+        }
+        self._bucket_ids = np.full(capacity, -1, dtype=np.int32)
+        # Single precision keeps a fleet of histories small, bucket sums of
+        # telemetry do not need more
+        self._sums = np.zeros((capacity, len(self._accessors)), dtype=np.float32)
+        self._counts = np.zeros((capacity, len(self._accessors)), dtype=np.uint16)
+        self._statistics: dict[int, dict[str, np.ndarray] | None] = {}
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory used by the buffers."""
+        return self._bucket_ids.nbytes + self._sums.nbytes + self._counts.nbytes
+
+    def column(self, accessor: SnapshotAccessor) -> int | None:
+        """Return the column a value is recorded in."""
+        return self._columns.get(accessor)
+
+    def record(self, snapshot: MinerSnapshot, timestamp: float | None = None) -> None:
+        """Add the values of a poll to the current bucket."""
+        if timestamp is None:
+            timestamp = time.time()
+        bucket_id = int(timestamp // self.bucket)
+        row = bucket_id % self.capacity
+        if self._bucket_ids[row] != bucket_id:
+            # The row still holds a bucket from a full capacity ago
+            self._bucket_ids[row] = bucket_id
+            self._sums[row] = 0
+            self._counts[row] = 0
+
+        values = np.array(
+            [accessor(snapshot) for accessor in self._accessors], dtype=np.float64
+        )
+        valid = ~np.isnan(values)
+        self._sums[row, valid] += values[valid]
+        self._counts[row, valid] += 1
+        self._statistics.clear()
+
+    def statistics(
+        self, window: int, now: float | None = None
+    ) -> dict[str, np.ndarray] | None:
+        """Return the statistics of all columns over a trailing window.
+
+        Results are cached until the next poll is recorded.
+        """
+        if window in self._statistics:
+            return self._statistics[window]
+
+        if now is None:
+            now = time.time()
+        last = int(now // self.bucket)
+        first = last - max(window // self.bucket, 1) + 1
+        rows = (self._bucket_ids >= first) & (self._bucket_ids <= last)
+        if not rows.any():
+            self._statistics[window] = None
+            return None
+
+        sums = self._sums[rows]
+        counts = self._counts[rows]
+        with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+            # Columns without any value in the window are all NaN
+            warnings.simplefilter("ignore", RuntimeWarning)
+            bucket_means = sums.astype(np.float64) / counts
+            result = {
+                "mean": sums.sum(axis=0, dtype=np.float64) / counts.sum(axis=0),
+                "min": np.nanmin(bucket_means, axis=0),
+                "max": np.nanmax(bucket_means, axis=0),
+                "p95": np.nanpercentile(bucket_means, 95, axis=0),
+            }
+        self._statistics[window] = result
+        return result
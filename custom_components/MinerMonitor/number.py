@@ -2,38 +2,31 @@
 from __future__ import annotations
 
 import logging
-from importlib.metadata import version
-
-from .const import PYASIC_VERSION
-
-try:
-    import pyasic
-
-    if not version("pyasic") == PYASIC_VERSION:
-        raise ImportError
-except ImportError:
-    from .patch import install_package
-
-    install_package(f"pyasic=={PYASIC_VERSION}")
-    import pyasic
 
 from homeassistant.components.number import NumberEntityDescription, NumberDeviceClass
 from homeassistant.components.number import NumberEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import callback
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers import device_registry
 from homeassistant.helpers import entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.components.sensor import EntityCategory
 from homeassistant.const import UnitOfPower
 
+from .const import CONF_MAX_POWER
+from .const import CONF_MIN_POWER
+from .const import DEFAULT_MAX_POWER
+from .const import DEFAULT_MIN_POWER
+from .const import DEFAULT_POWER_LIMIT_STEP
 from .const import DOMAIN
 from .coordinator import MinerCoordinator
+from .snapshot import miner_sensor_accessor
 
 _LOGGER = logging.getLogger(__name__)
 
+_POWER_LIMIT = miner_sensor_accessor("power_limit")
+
 
 NUMBER_DESCRIPTION_KEY_MAP: dict[str, NumberEntityDescription] = {
     "power_limit": NumberEntityDescription(
@@ -53,7 +46,6 @@ async def async_setup_entry(
     """Add sensors for passed config_entry in HA."""
     coordinator: MinerCoordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    await coordinator.async_config_entry_first_refresh()
     if coordinator.miner.supports_autotuning:
         async_add_entities(
             [
@@ -72,50 +64,35 @@ class MinerPowerLimitNumber(CoordinatorEntity[MinerCoordinator], NumberEntity):
         self, coordinator: MinerCoordinator, entity_description: NumberEntityDescription
     ):
         """Initialize the PowerLimit entity."""
-        super().__init__(coordinator=coordinator)
-        self._attr_native_value = self.coordinator.data["miner_sensors"]["power_limit"]
+        super().__init__(coordinator=coordinator, context=_POWER_LIMIT)
+        self._attr_native_value = _POWER_LIMIT(self.coordinator.data)
         self.entity_description = entity_description
-
-    @property
-    def name(self) -> str | None:
-        """Return name of the entity."""
-        return f"{self.coordinator.config_entry.title} Power Limit"
+        self._attr_name = f"{coordinator.config_entry.title} Power Limit"
 
     @property
     def device_info(self) -> entity.DeviceInfo:
         """Return device info."""
-        return entity.DeviceInfo(
-            identifiers={(DOMAIN, self.coordinator.data["mac"])},
-            connections={
-                ("ip", self.coordinator.data["ip"]),
-                (device_registry.CONNECTION_NETWORK_MAC, self.coordinator.data["mac"]),
-            },
-            configuration_url=f"http://{self.coordinator.data['ip']}",
-            manufacturer=self.coordinator.data["make"],
-            model=self.coordinator.data["model"],
-            sw_version=self.coordinator.data["fw_ver"],
-            name=f"{self.coordinator.config_entry.title}",
-        )
+        return self.coordinator.device_info
 
     @property
     def unique_id(self) -> str | None:
         """Return device UUID."""
-        return f"{self.coordinator.data['mac']}-power_limit"
+        return f"{self.coordinator.data.mac}-power_limit"
 
     @property
     def native_min_value(self) -> float | None:
         """Return device minimum value."""
-        return self.coordinator.data["power_limit_range"]["min"]
+        return self.coordinator.config_entry.data.get(CONF_MIN_POWER, DEFAULT_MIN_POWER)
 
     @property
     def native_max_value(self) -> float | None:
         """Return device maximum value."""
-        return self.coordinator.data["power_limit_range"]["max"]
+        return self.coordinator.config_entry.data.get(CONF_MAX_POWER, DEFAULT_MAX_POWER)
 
     @property
     def native_step(self) -> float | None:
         """Return device increment step."""
-        return 100
+        return DEFAULT_POWER_LIMIT_STEP
 
     @property
     def native_unit_of_measurement(self):
@@ -123,7 +100,11 @@ class MinerPowerLimitNumber(CoordinatorEntity[MinerCoordinator], NumberEntity):
         return "W"
 
     async def async_set_native_value(self, value):
-        """Update the current value."""
+        """Update the current value.
+
+        The value is shown right away, while bursts of changes are written
+        to the miner once by the coordinator.
+        """
 
         miner = self.coordinator.miner
 
@@ -136,20 +117,23 @@ class MinerPowerLimitNumber(CoordinatorEntity[MinerCoordinator], NumberEntity):
                 f"{self.coordinator.config_entry.title}: Tuning not supported."
             )
 
-        result = await miner.set_power_limit(int(value))
-
-        if not result:
-            raise pyasic.APIError("Failed to set wattage.")
-
         self._attr_native_value = value
         self.async_write_ha_state()
 
+        try:
+            await self.coordinator.async_set_power_limit(int(value))
+        finally:
+            # Show the limit read back from the miner, or the previous one if
+            # the write failed, unless a newer write is still pending
+            self._handle_coordinator_update()
+
     @callback
     def _handle_coordinator_update(self) -> None:
-        if self.coordinator.data["miner_sensors"]["power_limit"] is not None:
-            self._attr_native_value = self.coordinator.data["miner_sensors"][
-                "power_limit"
-            ]
+        # Keep the optimistic value until the pending limit is written
+        if self.coordinator.power_limit_target is None and (
+            (power_limit := _POWER_LIMIT(self.coordinator.data)) is not None
+        ):
+            self._attr_native_value = power_limit
 
         super()._handle_coordinator_update()
 
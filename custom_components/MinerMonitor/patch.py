@@ -1,20 +1,68 @@
 """Path annoying home assistant dependency handling."""
 from __future__ import annotations
 
+import asyncio
+import functools
+import importlib
 import os
 import site
 import sys
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version
 from subprocess import PIPE
 from subprocess import Popen
 
+from homeassistant.core import HomeAssistant
 from homeassistant.util.package import _LOGGER
 from homeassistant.util.package import is_virtual_env
 
+from .const import PYASIC_VERSION
+
 _UV_ENV_PYTHON_VARS = (
     "UV_SYSTEM_PYTHON",
     "UV_PYTHON",
 )
 
+_pyasic_lock = asyncio.Lock()
+_pyasic_ready = False
+
+
+@functools.cache
+def pyasic_installed() -> bool:
+    """Return if the pinned pyasic version is installed, cached per process."""
+    try:
+        return version("pyasic") == PYASIC_VERSION
+    except PackageNotFoundError:
+        return False
+
+
+def _install_pyasic() -> None:
+    """Install the pinned pyasic version if required, blocking."""
+    if pyasic_installed():
+        return
+    install_package(f"pyasic=={PYASIC_VERSION}")
+    pyasic_installed.cache_clear()
+    importlib.invalidate_caches()
+
+
+async def async_ensure_pyasic(hass: HomeAssistant) -> None:
+    """Install and import pyasic once, off the event loop.
+
+    Modules of the integration only import pyasic inside functions that run
+    after this has completed, so loading the integration stays cheap.
+    """
+    global _pyasic_ready
+
+    if _pyasic_ready:
+        return
+    async with _pyasic_lock:
+        if _pyasic_ready:
+            return
+        await hass.async_add_executor_job(_install_pyasic)
+        await hass.async_add_import_executor_job(importlib.import_module, "pyasic")
+        _pyasic_ready = True
+
+
 # Copy-paste of home assistant core install, but pre-releases are supported
 def install_package(
     package: str,
@@ -2,24 +2,7 @@
 from __future__ import annotations
 
 import logging
-from importlib.metadata import version
-
-from .const import PYASIC_VERSION
-
-try:
-    import pyasic
-
-    if not version("pyasic") == PYASIC_VERSION:
-        raise ImportError
-except ImportError:
-    from .patch import install_package
-
-    install_package(f"pyasic=={PYASIC_VERSION}")
-    import pyasic
-
-from pyasic.config.mining import MiningModeHPM
-from pyasic.config.mining import MiningModeLPM
-from pyasic.config.mining import MiningModeNormal
+from typing import TYPE_CHECKING
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
@@ -31,6 +14,10 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import MinerCoordinator
+from .snapshot import attribute_accessor
+
+if TYPE_CHECKING:
+    import pyasic
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -49,7 +36,6 @@ async def async_setup_entry(
         """Create a sensor entity."""
         created.add(key)
 
-    await coordinator.async_config_entry_first_refresh()
     if (
         coordinator.miner.supports_power_modes
         and not coordinator.miner.supports_autotuning
@@ -71,29 +57,19 @@ class MinerPowerModeSwitch(CoordinatorEntity[MinerCoordinator], SelectEntity):
         coordinator: MinerCoordinator,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator=coordinator)
-        self._attr_unique_id = f"{self.coordinator.data['mac']}-power-mode"
-
-    @property
-    def name(self) -> str | None:
-        """Return name of the entity."""
-        return f"{self.coordinator.config_entry.title} power mode"
+        super().__init__(coordinator=coordinator, context=attribute_accessor("config"))
+        self._attr_unique_id = f"{self.coordinator.data.mac}-power-mode"
+        self._attr_name = f"{coordinator.config_entry.title} power mode"
 
     @property
     def device_info(self) -> entity.DeviceInfo:
         """Return device info."""
-        return entity.DeviceInfo(
-            identifiers={(DOMAIN, self.coordinator.data["mac"])},
-            manufacturer=self.coordinator.data["make"],
-            model=self.coordinator.data["model"],
-            sw_version=self.coordinator.data["fw_ver"],
-            name=f"{self.coordinator.config_entry.title}",
-        )
+        return self.coordinator.device_info
 
     @property
     def current_option(self) -> str | None:
         """The current option selected with the select."""
-        config: pyasic.MinerConfig = self.coordinator.data.get("config")
+        config: pyasic.MinerConfig = self.coordinator.data.config
         if config and config.mining_mode:
             return str(config.mining_mode.mode).title()
         return None
@@ -105,11 +81,17 @@ class MinerPowerModeSwitch(CoordinatorEntity[MinerCoordinator], SelectEntity):
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
+        from pyasic.config.mining import MiningModeHPM
+        from pyasic.config.mining import MiningModeLPM
+        from pyasic.config.mining import MiningModeNormal
+
         option_map = {
             "High": MiningModeHPM,
             "Normal": MiningModeNormal,
             "Low": MiningModeLPM,
         }
-        cfg = await self.coordinator.miner.get_config()
-        cfg.mining_mode = option_map[option]()
-        await self.coordinator.miner.send_config(cfg)
+
+        def _set_mining_mode(config: pyasic.MinerConfig) -> None:
+            config.mining_mode = option_map[option]()
+
+        await self.coordinator.async_update_config(_set_mining_mode)
@@ -1,15 +1,19 @@
 """Support for Miner sensors."""
 from __future__ import annotations
 
+import dataclasses
 import logging
+import math
 
 from homeassistant.components.sensor import EntityCategory
+from homeassistant.components.sensor import RestoreSensor
 from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.components.sensor import SensorEntityDescription
 from homeassistant.components.sensor import SensorStateClass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import REVOLUTIONS_PER_MINUTE
+from homeassistant.const import UnitOfEnergy
 from homeassistant.const import UnitOfPower
 from homeassistant.const import UnitOfTemperature
 from homeassistant.core import HomeAssistant
@@ -19,10 +23,24 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers import entity
 
 from .const import DOMAIN, JOULES_PER_TERA_HASH, TERA_HASH_PER_SECOND
+from .const import HISTORY_WINDOWS
 from .coordinator import MinerCoordinator
+from .fleet import MinerFleetScheduler
+from .snapshot import board_sensor_accessor
+from .snapshot import BOARD_SENSOR_KEYS
+from .snapshot import chip_accessor
+from .snapshot import fan_sensor_accessor
+from .snapshot import FAN_SENSOR_KEYS
+from .snapshot import miner_sensor_accessor
+from .snapshot import MINER_SENSOR_KEYS
+from .snapshot import SnapshotAccessor
 
 _LOGGER = logging.getLogger(__name__)
 
+# Sensors with rolling statistics over each of the HISTORY_WINDOWS
+STATISTIC_SENSOR_KEYS = ("hashrate", "efficiency", "temperature")
+STATISTIC_BOARD_SENSOR_KEYS = ("board_hashrate", "board_temperature")
+
 ENTITY_DESCRIPTION_KEY_MAP: dict[str, SensorEntityDescription] = {
     "temperature": SensorEntityDescription(
         key="Temperature",
@@ -94,6 +112,12 @@ ENTITY_DESCRIPTION_KEY_MAP: dict[str, SensorEntityDescription] = {
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:speedometer",
     ),
+    "missing_chips": SensorEntityDescription(
+        key="Missing Chips",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:chip",
+    ),
     "fan_speed": SensorEntityDescription(
         key="Fan Speed",
         native_unit_of_measurement=REVOLUTIONS_PER_MINUTE,
@@ -136,6 +160,59 @@ ENTITY_DESCRIPTION_KEY_MAP: dict[str, SensorEntityDescription] = {
         icon="mdi:alert",
     ),
 }
+ENERGY_ENTITY_DESCRIPTION = SensorEntityDescription(
+    key="Energy",
+    native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+    state_class=SensorStateClass.TOTAL_INCREASING,
+    device_class=SensorDeviceClass.ENERGY,
+    suggested_display_precision=3,
+    icon="mdi:lightning-bolt",
+)
+
+FLEET_ENTITY_DESCRIPTION_KEY_MAP: dict[str, SensorEntityDescription] = {
+    "total_hashrate": SensorEntityDescription(
+        key="Total Hashrate",
+        native_unit_of_measurement=TERA_HASH_PER_SECOND,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:speedometer",
+    ),
+    "average_hashrate": SensorEntityDescription(
+        key="Average Hashrate",
+        native_unit_of_measurement=TERA_HASH_PER_SECOND,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:speedometer",
+    ),
+    "total_power": SensorEntityDescription(
+        key="Total Power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.POWER,
+        icon="mdi:flash",
+    ),
+    "efficiency": SensorEntityDescription(
+        key="Efficiency",
+        native_unit_of_measurement=JOULES_PER_TERA_HASH,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:oil",
+    ),
+    "miners_mining": SensorEntityDescription(
+        key="Miners Mining",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:pickaxe",
+    ),
+    "miners_offline": SensorEntityDescription(
+        key="Miners Offline",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:lan-disconnect",
+    ),
+    "hottest_board": SensorEntityDescription(
+        key="Hottest Board Temperature",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        icon="mdi:thermometer-high",
+    ),
+}
 
 
 async def async_setup_entry(
@@ -179,23 +256,95 @@ async def async_setup_entry(
             entity_description=description,
         )
 
-    await coordinator.async_config_entry_first_refresh()
+    def _create_statistic_entity(
+        sensor: str, window: str, board: tuple[int, int] | None = None
+    ) -> MinerStatisticSensor:
+        """Create a rolling statistic sensor of a miner or board sensor."""
+        description = ENTITY_DESCRIPTION_KEY_MAP[sensor]
+        description = dataclasses.replace(
+            description,
+            key=f"{description.key} {window} Average",
+            # Per board statistics are opt in to keep the entity count down
+            entity_registry_enabled_default=board is None,
+        )
+        if board is None:
+            return MinerStatisticSensor(
+                coordinator=coordinator,
+                accessor=miner_sensor_accessor(sensor),
+                unique_id=f"{sensor}-{window}",
+                window=window,
+                entity_description=description,
+            )
+        display_idx, board_num = board
+        return MinerStatisticSensor(
+            coordinator=coordinator,
+            accessor=board_sensor_accessor(board_num, sensor),
+            unique_id=f"board-{board_num}-{sensor}-{window}",
+            window=window,
+            entity_description=description,
+            name_prefix=f"Board #{display_idx} ",
+        )
 
     sensors = []
-    for s in coordinator.data["miner_sensors"]:
+    for s in MINER_SENSOR_KEYS:
         sensors.append(_create_miner_entity(s))
-    sorted_board_nums = sorted(coordinator.data["board_sensors"].keys())
+    sorted_board_nums = coordinator.data.board_slots
     for display_idx, board_num in enumerate(sorted_board_nums):
-        for sensor_type in ["board_temperature", "chip_temperature", "board_hashrate"]:
+        for sensor_type in BOARD_SENSOR_KEYS:
             sensors.append(
                 _create_board_entity(display_idx, board_num, sensor_type)
             )
+    # Dead boards report chips but no hashrate, so they are not board slots
+    chip_board_nums = sorted(
+        {
+            *coordinator.data.chip_values,
+            *sorted_board_nums,
+            *range(coordinator.miner.expected_hashboards or 0),
+        }
+    )
+    for display_idx, board_num in enumerate(chip_board_nums):
+        sensors.append(
+            MinerBoardChipSensor(
+                coordinator=coordinator,
+                display_idx=display_idx,
+                board_num=board_num,
+                entity_description=ENTITY_DESCRIPTION_KEY_MAP["missing_chips"],
+            )
+        )
+
+    sensors.append(
+        MinerEnergySensor(
+            coordinator=coordinator, entity_description=ENERGY_ENTITY_DESCRIPTION
+        )
+    )
 
     for fan in range(coordinator.miner.expected_fans):
-        for s in ["fan_speed"]:
+        for s in FAN_SENSOR_KEYS:
             sensors.append(_create_fan_entity(fan, s))
+
+    for window in HISTORY_WINDOWS:
+        for s in STATISTIC_SENSOR_KEYS:
+            sensors.append(_create_statistic_entity(s, window))
+        for board in enumerate(sorted_board_nums):
+            for s in STATISTIC_BOARD_SENSOR_KEYS:
+                sensors.append(_create_statistic_entity(s, window, board))
     async_add_entities(sensors)
 
+    fleet = coordinator.fleet
+
+    def _add_fleet_entities() -> None:
+        """Add the fleet aggregate sensors to this config entry."""
+        async_add_entities(
+            [
+                MinerFleetSensor(fleet=fleet, key=key, entity_description=description)
+                for key, description in FLEET_ENTITY_DESCRIPTION_KEY_MAP.items()
+            ]
+        )
+
+    config_entry.async_on_unload(
+        fleet.async_add_entity_platform(config_entry.entry_id, _add_fleet_entities)
+    )
+
 
 class MinerSensor(CoordinatorEntity[MinerCoordinator], SensorEntity):
     """Defines a Miner Sensor."""
@@ -209,34 +358,22 @@ class MinerSensor(CoordinatorEntity[MinerCoordinator], SensorEntity):
         entity_description: SensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator=coordinator)
-        self._attr_unique_id = f"{self.coordinator.data['mac']}-{sensor}"
+        self._accessor = miner_sensor_accessor(sensor)
+        super().__init__(coordinator=coordinator, context=self._accessor)
+        self._attr_unique_id = f"{self.coordinator.data.mac}-{sensor}"
         self._sensor = sensor
         self.entity_description = entity_description
+        self._attr_name = f"{coordinator.config_entry.title} {entity_description.key}"
 
     @property
     def _sensor_data(self):
         """Return sensor data."""
-        try:
-            return self.coordinator.data["miner_sensors"][self._sensor]
-        except LookupError:
-            return None
-
-    @property
-    def name(self) -> str | None:
-        """Return name of the entity."""
-        return f"{self.coordinator.config_entry.title} {self.entity_description.key}"
+        return self._accessor(self.coordinator.data)
 
     @property
     def device_info(self) -> entity.DeviceInfo:
         """Return device info."""
-        return entity.DeviceInfo(
-            identifiers={(DOMAIN, self.coordinator.data["mac"])},
-            manufacturer=self.coordinator.data["make"],
-            model=self.coordinator.data["model"],
-            sw_version=self.coordinator.data["fw_ver"],
-            name=f"{self.coordinator.config_entry.title}",
-        )
+        return self.coordinator.device_info
 
     @property
     def native_value(self) -> StateType:
@@ -258,41 +395,73 @@ class MinerBoardSensor(CoordinatorEntity[MinerCoordinator], SensorEntity):
         sensor: str,
         entity_description: SensorEntityDescription,
     ) -> None:
-        super().__init__(coordinator=coordinator)
-        self._attr_unique_id = f"{self.coordinator.data['mac']}-board-{board_num}-{sensor}"
+        self._accessor = board_sensor_accessor(board_num, sensor)
+        super().__init__(coordinator=coordinator, context=self._accessor)
+        self._attr_unique_id = f"{self.coordinator.data.mac}-board-{board_num}-{sensor}"
         self._display_idx = display_idx  # Reindexed Home Assistant-friendly number
         self._board_num = board_num      # Actual hardware board number
         self._sensor = sensor
         self.entity_description = entity_description
+        self._attr_name = f"{coordinator.config_entry.title} Board #{display_idx} {entity_description.key}"
 
     @property
     def _sensor_data(self):
         """Return sensor data."""
-        try:
-            return self.coordinator.data["board_sensors"][self._board_num][self._sensor]
-        except LookupError:
-            return None
+        return self._accessor(self.coordinator.data)
+
+    @property
+    def device_info(self) -> entity.DeviceInfo:
+        """Return device info."""
+        return self.coordinator.device_info
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self._sensor_data
 
     @property
-    def name(self) -> str | None:
-        """Return name of the entity."""
-        return f"{self.coordinator.config_entry.title} Board #{self._display_idx} {self.entity_description.key}"
+    def available(self) -> bool:
+        """Return if entity is available or not."""
+        return self.coordinator.available
+
+
+class MinerBoardChipSensor(CoordinatorEntity[MinerCoordinator], SensorEntity):
+    """Defines the missing chips of a Miner board, with its chip data."""
+
+    entity_description: SensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: MinerCoordinator,
+        display_idx: int,
+        board_num: int,
+        entity_description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self._accessor = chip_accessor(board_num, "missing_chips")
+        super().__init__(coordinator=coordinator, context=self._accessor)
+        self._attr_unique_id = f"{self.coordinator.data.mac}-board-{board_num}-missing_chips"
+        self._board_num = board_num
+        self.entity_description = entity_description
+        self._attr_name = f"{coordinator.config_entry.title} Board #{display_idx} {entity_description.key}"
 
     @property
     def device_info(self) -> entity.DeviceInfo:
         """Return device info."""
-        return entity.DeviceInfo(
-            identifiers={(DOMAIN, self.coordinator.data["mac"])},
-            manufacturer=self.coordinator.data["make"],
-            model=self.coordinator.data["model"],
-            sw_version=self.coordinator.data["fw_ver"],
-            name=f"{self.coordinator.config_entry.title}",
-        )
+        return self.coordinator.device_info
 
     @property
     def native_value(self) -> StateType:
         """Return the state of the sensor."""
-        return self._sensor_data
+        return self._accessor(self.coordinator.data)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, float | None]:
+        """Return the chip counts of the board."""
+        return {
+            key: chip_accessor(self._board_num, key)(self.coordinator.data)
+            for key in ("chips", "expected_chips")
+        }
 
     @property
     def available(self) -> bool:
@@ -313,36 +482,23 @@ class MinerFanSensor(CoordinatorEntity[MinerCoordinator], SensorEntity):
         entity_description: SensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator=coordinator)
-        self._attr_unique_id = f"{self.coordinator.data['mac']}-{fan_num}-{sensor}"
+        self._accessor = fan_sensor_accessor(fan_num, sensor)
+        super().__init__(coordinator=coordinator, context=self._accessor)
+        self._attr_unique_id = f"{self.coordinator.data.mac}-{fan_num}-{sensor}"
         self._fan_num = fan_num
         self._sensor = sensor
         self.entity_description = entity_description
-        self._attr_force_update = True
+        self._attr_name = f"{coordinator.config_entry.title} Fan #{fan_num} {entity_description.key}"
 
     @property
     def _sensor_data(self):
         """Return sensor data."""
-        try:
-            return self.coordinator.data["fan_sensors"][self._fan_num][self._sensor]
-        except LookupError:
-            return None
-
-    @property
-    def name(self) -> str | None:
-        """Return name of the entity."""
-        return f"{self.coordinator.config_entry.title} Fan #{self._fan_num} {self.entity_description.key}"
+        return self._accessor(self.coordinator.data)
 
     @property
     def device_info(self) -> entity.DeviceInfo:
         """Return device info."""
-        return entity.DeviceInfo(
-            identifiers={(DOMAIN, self.coordinator.data["mac"])},
-            manufacturer=self.coordinator.data["make"],
-            model=self.coordinator.data["model"],
-            sw_version=self.coordinator.data["fw_ver"],
-            name=f"{self.coordinator.config_entry.title}",
-        )
+        return self.coordinator.device_info
 
     @property
     def native_value(self) -> StateType:
@@ -353,3 +509,142 @@ class MinerFanSensor(CoordinatorEntity[MinerCoordinator], SensorEntity):
     def available(self) -> bool:
         """Return if entity is available or not."""
         return self.coordinator.available
+
+
+class MinerStatisticSensor(CoordinatorEntity[MinerCoordinator], SensorEntity):
+    """Defines a rolling mean of a Miner Sensor from the telemetry history."""
+
+    entity_description: SensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: MinerCoordinator,
+        accessor: SnapshotAccessor,
+        unique_id: str,
+        window: str,
+        entity_description: SensorEntityDescription,
+        name_prefix: str = "",
+    ) -> None:
+        """Initialize the sensor."""
+        # The statistics move on every poll, so always update
+        super().__init__(coordinator=coordinator)
+        self._accessor = accessor
+        self._window = HISTORY_WINDOWS[window]
+        self._attr_unique_id = f"{self.coordinator.data.mac}-{unique_id}"
+        self.entity_description = entity_description
+        self._attr_name = f"{coordinator.config_entry.title} {name_prefix}{entity_description.key}"
+
+    @property
+    def _statistics(self) -> dict[str, float]:
+        """Return the statistics of the sensor over the window."""
+        history = self.coordinator.history
+        if history is None or (column := history.column(self._accessor)) is None:
+            return {}
+        if (statistics := history.statistics(self._window)) is None:
+            return {}
+        return {
+            name: round(float(values[column]), 2)
+            for name, values in statistics.items()
+            if not math.isnan(values[column])
+        }
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the mean over the window."""
+        return self._statistics.get("mean")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, float]:
+        """Return the min, max and p95 over the window."""
+        return {
+            name: value for name, value in self._statistics.items() if name != "mean"
+        }
+
+    @property
+    def device_info(self) -> entity.DeviceInfo:
+        """Return device info."""
+        return self.coordinator.device_info
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available or not."""
+        return self.coordinator.available and "mean" in self._statistics
+
+
+class MinerFleetSensor(SensorEntity):
+    """Defines an aggregate sensor over all configured miners."""
+
+    entity_description: SensorEntityDescription
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        fleet: MinerFleetScheduler,
+        key: str,
+        entity_description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self._fleet = fleet
+        self._key = key
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{DOMAIN}-fleet-{key}"
+        self._attr_name = f"Miner Fleet {entity_description.key}"
+        self._attr_device_info = fleet.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Update the state whenever the fleet aggregates are computed."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._fleet.async_add_aggregate_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self._fleet.aggregates.get(self._key)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, str] | None:
+        """Return the miner with the hottest board."""
+        if self._key != "hottest_board":
+            return None
+        return {"miner": self._fleet.aggregates.get("hottest_miner")}
+
+
+class MinerEnergySensor(CoordinatorEntity[MinerCoordinator], RestoreSensor):
+    """Defines the energy used by a Miner, integrated by the coordinator."""
+
+    entity_description: SensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: MinerCoordinator,
+        entity_description: SensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        # The total grows on every poll, always update
+        super().__init__(coordinator=coordinator)
+        self._attr_unique_id = f"{self.coordinator.data.mac}-energy"
+        self.entity_description = entity_description
+        self._attr_name = f"{coordinator.config_entry.title} {entity_description.key}"
+
+    async def async_added_to_hass(self) -> None:
+        """Continue the total from before the restart."""
+        await super().async_added_to_hass()
+        if (last_sensor_data := await self.async_get_last_sensor_data()) is None:
+            return
+        try:
+            energy = float(last_sensor_data.native_value)
+        except (TypeError, ValueError):
+            return
+        self.coordinator.async_restore_energy(energy)
+
+    @property
+    def device_info(self) -> entity.DeviceInfo:
+        """Return device info."""
+        return self.coordinator.device_info
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return round(self.coordinator.energy, 3)
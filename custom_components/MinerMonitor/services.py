@@ -3,51 +3,249 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 
-from homeassistant.const import CONF_DEVICE_ID
+import voluptuous as vol
+from homeassistant.core import callback
 from homeassistant.core import HomeAssistant
 from homeassistant.core import ServiceCall
+from homeassistant.core import ServiceResponse
+from homeassistant.core import SupportsResponse
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.device_registry import async_get as async_get_device_registry
+from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
 
+from .budget import async_apply_power_budget
+from .const import ATTR_ALL
+from .const import ATTR_BATCH_DELAY
+from .const import ATTR_BATCH_SIZE
+from .const import ATTR_CONCURRENCY
+from .const import ATTR_POWER_BUDGET
+from .const import ATTR_TIMEOUT
+from .const import DEFAULT_POWER_BUDGET_TIMEOUT
+from .const import DEFAULT_SERVICE_CONCURRENCY
 from .const import DOMAIN
+from .const import SERVICE_GET_CHIP_DATA
+from .const import SERVICE_GET_FLEET_STATUS
 from .const import SERVICE_REBOOT
 from .const import SERVICE_RESTART_BACKEND
+from .const import SERVICE_SET_POWER_BUDGET
+from .coordinator import MinerCoordinator
+from .fleet import async_get_fleet_scheduler
+from .snapshot import BOARD_SENSOR_KEYS
+from .snapshot import CHIP_KEYS
 
 LOGGER = logging.getLogger(__name__)
 
+MINER_ACTION_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ALL, default=False): cv.boolean,
+        vol.Optional(ATTR_CONCURRENCY, default=DEFAULT_SERVICE_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=256)
+        ),
+        vol.Optional(ATTR_BATCH_SIZE, default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_BATCH_DELAY, default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=3600)
+        ),
+        **cv.TARGET_SERVICE_FIELDS,
+    }
+)
 
-async def async_setup_services(hass: HomeAssistant) -> None:
-    """Service handler setup."""
+POWER_BUDGET_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_POWER_BUDGET): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(ATTR_ALL, default=False): cv.boolean,
+        vol.Optional(ATTR_TIMEOUT, default=DEFAULT_POWER_BUDGET_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+        vol.Optional(ATTR_CONCURRENCY, default=DEFAULT_SERVICE_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=256)
+        ),
+        **cv.TARGET_SERVICE_FIELDS,
+    }
+)
+
+CHIP_DATA_SCHEMA = vol.Schema(cv.TARGET_SERVICE_FIELDS)
+
+
+@callback
+def async_get_target_coordinators(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[MinerCoordinator]:
+    """Return the coordinators of all, or of the targeted miner devices.
+
+    Devices, areas, labels and entities are resolved to the identifiers of
+    the miner devices, so the fleet device and its sensors select no miner.
+    """
+    coordinators: dict[str, MinerCoordinator] = hass.data.get(DOMAIN, {})
+    if call.data.get(ATTR_ALL):
+        return list(coordinators.values())
 
-    async def get_miners(call: ServiceCall):
-        hass_devices = hass.data[DOMAIN]
+    by_identifier = {
+        (DOMAIN, coordinator.data.mac): coordinator
+        for coordinator in coordinators.values()
+        if coordinator.data is not None and coordinator.data.mac
+    }
+    selected = async_extract_referenced_entity_ids(hass, call, expand_group=False)
+    device_ids = set(selected.referenced_devices)
+    entity_registry = async_get_entity_registry(hass)
+    for entity_id in selected.referenced | selected.indirectly_referenced:
+        if (entry := entity_registry.async_get(entity_id)) is not None and (
+            entry.platform == DOMAIN and entry.device_id
+        ):
+            device_ids.add(entry.device_id)
 
-        miner_ids = call.data[CONF_DEVICE_ID]
+    device_registry = async_get_device_registry(hass)
+    targets: dict[str, MinerCoordinator] = {}
+    for device_id in device_ids:
+        if (device := device_registry.async_get(device_id)) is None:
+            continue
+        for identifier in device.identifiers & by_identifier.keys():
+            coordinator = by_identifier[identifier]
+            targets[coordinator.config_entry.entry_id] = coordinator
+    return [targets[entry_id] for entry_id in sorted(targets)]
 
-        if not miner_ids:
-            return
 
-        registry = async_get_device_registry(hass)
+async def async_run_miner_action(
+    coordinators: list[MinerCoordinator],
+    action: str,
+    concurrency: int,
+    batch_size: int = 0,
+    batch_delay: float = 0,
+) -> list[dict]:
+    """Run a miner action in batches, with at most concurrency in flight.
 
-        return await asyncio.gather(
-            *(
-                [
-                    hass_devices[registry.async_get(d).primary_config_entry].get_miner()
-                    for d in miner_ids
-                ]
+    The cached miner of each coordinator is used, a miner is only detected
+    if the coordinator has none.  Return the result and latency per miner.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _async_run(coordinator: MinerCoordinator) -> dict:
+        result = {
+            "entry_id": coordinator.config_entry.entry_id,
+            "name": coordinator.config_entry.title,
+            "success": False,
+        }
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                if (
+                    miner := coordinator.miner or await coordinator.get_miner()
+                ) is None:
+                    result["error"] = "Miner Offline"
+                else:
+                    result["success"] = bool(await getattr(miner, action)())
+            except Exception as err:
+                LOGGER.debug("%s of %s failed: %s", action, coordinator.name, err)
+                result["error"] = str(err)
+            result["latency"] = round(time.monotonic() - started, 3)
+        return result
+
+    batch_size = batch_size or len(coordinators) or 1
+    results = []
+    for start in range(0, len(coordinators), batch_size):
+        if start and batch_delay:
+            await asyncio.sleep(batch_delay)
+        results.extend(
+            await asyncio.gather(
+                *(_async_run(c) for c in coordinators[start : start + batch_size])
             )
         )
+    return results
 
-    async def reboot(call: ServiceCall) -> None:
-        miners = await get_miners(call)
-        if len(miners) > 0:
-            await asyncio.gather(*[miner.reboot() for miner in miners])
 
-    hass.services.async_register(DOMAIN, SERVICE_REBOOT, reboot)
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Service handler setup."""
 
-    async def restart_backend(call: ServiceCall) -> None:
-        miners = await get_miners(call)
-        if len(miners) > 0:
-            await asyncio.gather(*[miner.restart_backend() for miner in miners])
+    async def run_miner_action(call: ServiceCall, action: str) -> ServiceResponse:
+        results = await async_run_miner_action(
+            async_get_target_coordinators(hass, call),
+            action,
+            concurrency=call.data[ATTR_CONCURRENCY],
+            batch_size=call.data[ATTR_BATCH_SIZE],
+            batch_delay=call.data[ATTR_BATCH_DELAY],
+        )
+        return {"results": results}
+
+    async def reboot(call: ServiceCall) -> ServiceResponse:
+        return await run_miner_action(call, "reboot")
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REBOOT,
+        reboot,
+        schema=MINER_ACTION_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def restart_backend(call: ServiceCall) -> ServiceResponse:
+        return await run_miner_action(call, "restart_backend")
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESTART_BACKEND,
+        restart_backend,
+        schema=MINER_ACTION_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def get_fleet_status(call: ServiceCall) -> ServiceResponse:
+        return async_get_fleet_scheduler(hass).as_dict()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_FLEET_STATUS,
+        get_fleet_status,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def get_chip_data(call: ServiceCall) -> ServiceResponse:
+        response = {}
+        for coordinator in async_get_target_coordinators(hass, call):
+            data = coordinator.data
+            response[coordinator.config_entry.entry_id] = {
+                "name": coordinator.config_entry.title,
+                "boards": [
+                    {
+                        "slot": slot,
+                        **dict(zip(CHIP_KEYS, chip_values)),
+                        **dict(
+                            zip(
+                                BOARD_SENSOR_KEYS,
+                                data.board_values.get(
+                                    slot, (None,) * len(BOARD_SENSOR_KEYS)
+                                ),
+                            )
+                        ),
+                    }
+                    for slot, chip_values in sorted(data.chip_values.items())
+                ],
+            }
+        return response
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_CHIP_DATA,
+        get_chip_data,
+        schema=CHIP_DATA_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def set_power_budget(call: ServiceCall) -> ServiceResponse:
+        return await async_apply_power_budget(
+            async_get_target_coordinators(hass, call),
+            call.data[ATTR_POWER_BUDGET],
+            timeout=call.data[ATTR_TIMEOUT],
+            concurrency=call.data[ATTR_CONCURRENCY],
+        )
 
-    hass.services.async_register(DOMAIN, SERVICE_RESTART_BACKEND, restart_backend)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_POWER_BUDGET,
+        set_power_budget,
+        schema=POWER_BUDGET_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
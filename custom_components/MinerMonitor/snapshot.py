@@ -0,0 +1,284 @@
+"""Compact snapshot of the data polled from a miner."""
+from __future__ import annotations
+
+import functools
+from typing import Any
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pyasic
+
+MINER_SENSOR_KEYS = (
+    "hashrate",
+    "ideal_hashrate",
+    "temperature",
+    "power_limit",
+    "miner_consumption",
+    "efficiency",
+    "percent_expected_hashrate",
+    "uptime",
+    "env_temp",
+    "errors",
+    "fault_light",
+)
+BOARD_SENSOR_KEYS = ("board_temperature", "chip_temperature", "board_hashrate")
+FAN_SENSOR_KEYS = ("fan_speed",)
+# Chip data of every board, also of boards that report no hashrate
+CHIP_KEYS = ("chips", "expected_chips", "missing_chips", "voltage")
+
+_MINER_SENSOR_INDEX = {key: idx for idx, key in enumerate(MINER_SENSOR_KEYS)}
+_BOARD_SENSOR_INDEX = {key: idx for idx, key in enumerate(BOARD_SENSOR_KEYS)}
+_CHIP_INDEX = {key: idx for idx, key in enumerate(CHIP_KEYS)}
+
+
+class MinerSnapshot:
+    """Data of one poll, stored in tuples instead of nested dicts.
+
+    Miner sensor values are ordered like MINER_SENSOR_KEYS, board values like
+    BOARD_SENSOR_KEYS and chip values like CHIP_KEYS.  Entities read them
+    through a SnapshotAccessor.
+    """
+
+    __slots__ = (
+        "hostname",
+        "mac",
+        "make",
+        "model",
+        "ip",
+        "is_mining",
+        "fw_ver",
+        "miner_values",
+        "board_values",
+        "chip_values",
+        "fan_speeds",
+        "config",
+    )
+
+    def __init__(
+        self,
+        hostname: str | None,
+        mac: str | None,
+        make: str | None,
+        model: str | None,
+        ip: str,
+        is_mining: bool | None,
+        fw_ver: str | None,
+        miner_values: tuple,
+        board_values: dict[int, tuple],
+        chip_values: dict[int, tuple],
+        fan_speeds: tuple,
+        config: pyasic.MinerConfig | None,
+    ) -> None:
+        """Initialize the snapshot."""
+        self.hostname = hostname
+        self.mac = mac
+        self.make = make
+        self.model = model
+        self.ip = ip
+        self.is_mining = is_mining
+        self.fw_ver = fw_ver
+        self.miner_values = miner_values
+        self.board_values = board_values
+        self.chip_values = chip_values
+        self.fan_speeds = fan_speeds
+        self.config = config
+
+    @property
+    def board_slots(self) -> list[int]:
+        """Return the hardware slots of the reporting boards."""
+        return sorted(self.board_values)
+
+    @classmethod
+    def from_miner_data(cls, miner_data: pyasic.MinerData, ip: str) -> MinerSnapshot:
+        """Build a snapshot from pyasic miner data."""
+        # Process errors into a string for sensor display
+        if miner_data.errors:
+            errors_str = (
+                "; ".join(
+                    getattr(e, "error_message", str(e)) for e in miner_data.errors
+                )
+                or "No errors"
+            )
+        else:
+            errors_str = ""
+
+        return cls(
+            miner_data.hostname,
+            miner_data.mac,
+            miner_data.make,
+            miner_data.model,
+            ip,
+            miner_data.is_mining,
+            miner_data.fw_ver,
+            (
+                _round_hashrate(miner_data.hashrate),
+                _round_hashrate(miner_data.expected_hashrate),
+                miner_data.temperature_avg,
+                miner_data.wattage_limit,
+                miner_data.wattage,
+                miner_data.efficiency,
+                miner_data.percent_expected_hashrate,
+                miner_data.uptime,
+                miner_data.env_temp,
+                errors_str,
+                miner_data.fault_light,
+            ),
+            {
+                board.slot: (
+                    board.temp,
+                    board.chip_temp,
+                    round(float(board.hashrate or 0), 2),
+                )
+                for board in miner_data.hashboards
+                if board.hashrate is not None
+            },
+            {
+                board.slot: (
+                    board.chips,
+                    board.expected_chips,
+                    _missing_chips(board.chips, board.expected_chips),
+                    board.voltage,
+                )
+                for board in miner_data.hashboards
+            },
+            tuple([fan.speed for fan in miner_data.fans]),
+            miner_data.config,
+        )
+
+    @classmethod
+    def from_cache(cls, record: dict, ip: str) -> MinerSnapshot:
+        """Build an empty snapshot from a detection cache record."""
+        return cls(
+            hostname=record.get("hostname"),
+            mac=record["mac"],
+            make=record.get("make"),
+            model=record.get("model"),
+            ip=ip,
+            is_mining=None,
+            fw_ver=record.get("fw_ver"),
+            miner_values=(None,) * len(MINER_SENSOR_KEYS),
+            board_values={
+                slot: (None,) * len(BOARD_SENSOR_KEYS) for slot in record["board_slots"]
+            },
+            chip_values={},
+            fan_speeds=(None,) * (record.get("expected_fans") or 0),
+            config=None,
+        )
+
+    def set_miner_value(self, key: str, value: Any) -> None:
+        """Replace one miner sensor value, e.g. after a control action."""
+        values = list(self.miner_values)
+        values[_MINER_SENSOR_INDEX[key]] = value
+        self.miner_values = tuple(values)
+
+
+def _missing_chips(chips: int | None, expected_chips: int | None) -> int | None:
+    """Return how many chips of a board are not detected."""
+    if chips is None or not expected_chips:
+        return None
+    return max(expected_chips - chips, 0)
+
+
+def _round_hashrate(hashrate) -> float | None:
+    """Return a hashrate as a rounded float."""
+    try:
+        return round(float(hashrate), 2)
+    except (TypeError, ValueError):
+        return None
+
+
+class SnapshotAccessor:
+    """Precomputed accessor for one value of a snapshot.
+
+    Accessors are shared by all miners and used as the listener context of
+    entities, so they hash and compare by their path.
+    """
+
+    __slots__ = ("path", "key", "_name", "_index")
+
+    def __init__(self, path: tuple, key: str, name: str, index=None) -> None:
+        """Initialize the accessor for an attribute, optionally indexed."""
+        self.path = path
+        self.key = key
+        self._name = name
+        self._index = index
+
+    def __call__(self, snapshot: MinerSnapshot | None) -> Any:
+        """Return the value from a snapshot."""
+        try:
+            value = getattr(snapshot, self._name)
+            if self._index is None:
+                return value
+            return value[self._index]
+        except (AttributeError, LookupError):
+            return None
+
+    def __hash__(self) -> int:
+        """Hash by path."""
+        return hash(self.path)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare by path."""
+        return isinstance(other, SnapshotAccessor) and other.path == self.path
+
+    def __repr__(self) -> str:
+        """Return the path of the accessor."""
+        return f"SnapshotAccessor{self.path}"
+
+
+class _BoardSensorAccessor(SnapshotAccessor):
+    """Accessor for a value of the board in a hardware slot."""
+
+    __slots__ = ("_slot",)
+
+    def __init__(self, path: tuple, key: str, name: str, slot: int, index: int) -> None:
+        """Initialize the accessor."""
+        super().__init__(path, key, name, index)
+        self._slot = slot
+
+    def __call__(self, snapshot: MinerSnapshot | None) -> Any:
+        """Return the value from a snapshot."""
+        try:
+            return getattr(snapshot, self._name)[self._slot][self._index]
+        except (AttributeError, LookupError):
+            return None
+
+
+@functools.cache
+def attribute_accessor(name: str) -> SnapshotAccessor:
+    """Return an accessor for a snapshot attribute."""
+    return SnapshotAccessor((name,), name, name)
+
+
+@functools.cache
+def miner_sensor_accessor(key: str) -> SnapshotAccessor:
+    """Return an accessor for a miner sensor."""
+    return SnapshotAccessor(
+        ("miner_sensors", key), key, "miner_values", _MINER_SENSOR_INDEX[key]
+    )
+
+
+@functools.cache
+def board_sensor_accessor(board_num: int, key: str) -> SnapshotAccessor:
+    """Return an accessor for a sensor of the board in a hardware slot."""
+    return _BoardSensorAccessor(
+        ("board_sensors", board_num, key),
+        key,
+        "board_values",
+        board_num,
+        _BOARD_SENSOR_INDEX[key],
+    )
+
+
+@functools.cache
+def chip_accessor(board_num: int, key: str) -> SnapshotAccessor:
+    """Return an accessor for the chip data of the board in a hardware slot."""
+    return _BoardSensorAccessor(
+        ("chips", board_num, key), key, "chip_values", board_num, _CHIP_INDEX[key]
+    )
+
+
+@functools.cache
+def fan_sensor_accessor(fan_num: int, key: str) -> SnapshotAccessor:
+    """Return an accessor for a fan sensor."""
+    return SnapshotAccessor(("fan_sensors", fan_num, key), key, "fan_speeds", fan_num)
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+from typing import TYPE_CHECKING
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
@@ -13,6 +14,10 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import MinerCoordinator
+from .snapshot import attribute_accessor
+
+if TYPE_CHECKING:
+    import pyasic
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,7 +36,6 @@ async def async_setup_entry(
         """Create a sensor entity."""
         created.add(key)
 
-    await coordinator.async_config_entry_first_refresh()
     if coordinator.miner.supports_shutdown:
         async_add_entities(
             [
@@ -50,27 +54,20 @@ class MinerActiveSwitch(CoordinatorEntity[MinerCoordinator], SwitchEntity):
         coordinator: MinerCoordinator,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator=coordinator)
-        self._attr_unique_id = f"{self.coordinator.data['mac']}-active"
-        self._attr_is_on = self.coordinator.data["is_mining"]
-        self.updating_switch = False
+        super().__init__(
+            coordinator=coordinator, context=attribute_accessor("is_mining")
+        )
+        self._attr_unique_id = f"{self.coordinator.data.mac}-active"
+        self._attr_name = f"{coordinator.config_entry.title} active"
+        self._attr_is_on = self.coordinator.data.is_mining
+        # Requested state, shown until the miner reports it
+        self._pending_is_on: bool | None = None
         self._last_mining_mode = None
 
-    @property
-    def name(self) -> str | None:
-        """Return name of the entity."""
-        return f"{self.coordinator.config_entry.title} active"
-
     @property
     def device_info(self) -> entity.DeviceInfo:
         """Return device info."""
-        return entity.DeviceInfo(
-            identifiers={(DOMAIN, self.coordinator.data["mac"])},
-            manufacturer=self.coordinator.data["make"],
-            model=self.coordinator.data["model"],
-            sw_version=self.coordinator.data["fw_ver"],
-            name=f"{self.coordinator.config_entry.title}",
-        )
+        return self.coordinator.device_info
 
     async def async_turn_on(self) -> None:
         """Turn on miner."""
@@ -78,14 +75,16 @@ class MinerActiveSwitch(CoordinatorEntity[MinerCoordinator], SwitchEntity):
         _LOGGER.debug(f"{self.coordinator.config_entry.title}: Resume mining.")
         if not miner.supports_shutdown:
             raise TypeError(f"{miner}: Shutdown not supported.")
-        self._attr_is_on = True
+        self._attr_is_on = self._pending_is_on = True
         await miner.resume_mining()
-        if miner.supports_power_modes:
-            config = await miner.get_config()
-            config.mining_mode = self._last_mining_mode
-            await miner.send_config(config)
-        self.updating_switch = True
         self.async_write_ha_state()
+        if miner.supports_power_modes and self._last_mining_mode is not None:
+            await self.coordinator.async_update_config(self._restore_mining_mode)
+        await self._async_refresh_is_mining()
+
+    def _restore_mining_mode(self, config: pyasic.MinerConfig) -> None:
+        """Restore the mining mode from before the miner was stopped."""
+        config.mining_mode = self._last_mining_mode
 
     async def async_turn_off(self) -> None:
         """Turn off miner."""
@@ -94,20 +93,26 @@ class MinerActiveSwitch(CoordinatorEntity[MinerCoordinator], SwitchEntity):
         if not miner.supports_shutdown:
             raise TypeError(f"{miner}: Shutdown not supported.")
         if miner.supports_power_modes:
-            self._last_mining_mode = self.coordinator.data["config"].mining_mode
-        self._attr_is_on = False
+            config = await self.coordinator.async_get_config()
+            self._last_mining_mode = config.mining_mode
+        self._attr_is_on = self._pending_is_on = False
         await miner.stop_mining()
-        self.updating_switch = True
         self.async_write_ha_state()
+        await self._async_refresh_is_mining()
+
+    async def _async_refresh_is_mining(self) -> None:
+        """Read back if the miner is mining and show it once it agrees."""
+        await self.coordinator.async_refresh_fields("is_mining")
+        self._handle_coordinator_update()
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        is_mining = self.coordinator.data["is_mining"]
+        is_mining = self.coordinator.data.is_mining
         if is_mining is not None:
-            if self.updating_switch:
-                if is_mining == self._attr_is_on:
-                    self.updating_switch = False
-            if not self.updating_switch:
+            # Keep the requested state until a read or poll confirms it
+            if self._pending_is_on is not None and is_mining == self._pending_is_on:
+                self._pending_is_on = None
+            if self._pending_is_on is None:
                 self._attr_is_on = is_mining
 
         super()._handle_coordinator_update()
@@ -0,0 +1,76 @@
+"""Shared keep-alive HTTP transport for the pyasic web backends."""
+from __future__ import annotations
+
+import logging
+from ssl import SSLContext
+
+import httpx
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import callback
+from homeassistant.core import Event
+from homeassistant.core import HomeAssistant
+
+from .const import DEFAULT_KEEPALIVE_CONNECTIONS
+from .const import DEFAULT_KEEPALIVE_EXPIRY
+
+_LOGGER = logging.getLogger(__name__)
+
+_transports: dict[str | bool | SSLContext, SharedTransport] = {}
+
+
+class SharedTransport(httpx.AsyncHTTPTransport):
+    """Connection pool that outlives the clients using it.
+
+    pyasic opens a new client for every web request and closes it right
+    after, which also closes its transport.  Closing is ignored here so the
+    connections to a miner are kept alive between polls and control
+    actions, idle ones are evicted after DEFAULT_KEEPALIVE_EXPIRY.
+    """
+
+    async def __aexit__(self, *args) -> None:
+        """Keep the pool open when a client exits."""
+
+    async def aclose(self) -> None:
+        """Keep the pool open when a client is closed."""
+
+    async def async_shutdown(self) -> None:
+        """Close all pooled connections."""
+        await super().aclose()
+
+
+def shared_transport(
+    verify: str | bool | SSLContext | None = None,
+) -> SharedTransport:
+    """Return the shared transport, drop in for pyasic.settings.transport."""
+    from pyasic import settings
+
+    if verify is None:
+        verify = settings.ssl_cxt
+    if (transport := _transports.get(verify)) is None:
+        transport = _transports[verify] = SharedTransport(
+            verify=verify,
+            limits=httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=DEFAULT_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+            ),
+        )
+    return transport
+
+
+@callback
+def async_setup_shared_transport(hass: HomeAssistant) -> None:
+    """Route the web requests of pyasic through the shared transport once."""
+    from pyasic import settings
+
+    if settings.transport is shared_transport:
+        return
+    settings.transport = shared_transport
+
+    async def _async_shutdown(_event: Event) -> None:
+        for transport in list(_transports.values()):
+            await transport.async_shutdown()
+        _transports.clear()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_shutdown)
+    _LOGGER.debug("Reusing web connections to miners")